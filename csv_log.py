@@ -0,0 +1,173 @@
+import csv
+import io
+import os
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+CHUNK_SIZE = 1 << 20  # read in 1 MiB pieces so memory stays flat on huge files
+
+
+@contextmanager
+def file_lock(f, exclusive=True):
+    """Holds an OS-level lock on an open file so concurrent processes cannot interleave writes."""
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        try:
+            yield
+        finally:
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+    else:
+        # msvcrt only has exclusive locks; lock the first byte as a mutex for the whole file
+        position = f.tell()
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        f.seek(position)
+        try:
+            yield
+        finally:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+            f.seek(position)
+
+
+def read_rows(f, offset, on_row):
+    """
+    Hands each complete row of an open CSV file past byte `offset` to on_row and returns
+    the offset after the last complete row. The header is skipped when starting from 0.
+    Caller holds the file lock.
+    """
+    f.seek(offset)
+    while True:
+        data = f.read(CHUNK_SIZE)
+        # A row still being written by another process has no newline yet; leave it for next time
+        end = data.rfind(b"\n") + 1
+        if end == 0:
+            return offset
+        rows = csv.reader(io.StringIO(data[:end].decode("utf-8"), newline=""))
+        if offset == 0:
+            next(rows, None)  # header
+        for row in rows:
+            if row:
+                on_row(row)
+        offset += end
+        f.seek(offset)
+
+
+class CsvLog:
+    """
+    Append-only CSV file shared safely between sessions and processes.
+    Rows are appended under an exclusive file lock and fsynced every `fsync_every` rows.
+    The log remembers how far into the file it has read, so refresh() only parses rows
+    appended since the last call (by this or any other process) and hands each to `on_row`.
+    """
+
+    def __init__(self, path, header, on_row, fsync_every=1, offset=0):
+        self.path = path
+        self.header = header
+        self.on_row = on_row
+        self.fsync_every = fsync_every
+        # Bytes of the file already handed to on_row; a caller that persisted its own state
+        # can resume from a saved offset instead of re-reading the whole file
+        self._offset = offset
+        self._unsynced = 0
+        self._mutex = threading.Lock()
+        with open(self.path, "ab") as f:
+            with file_lock(f):
+                if f.seek(0, os.SEEK_END) == 0:
+                    f.write((",".join(header) + "\n").encode("utf-8"))
+        self.refresh()
+
+    def _read_new_rows(self, f):
+        """Hands complete rows past the current offset to on_row. Caller holds the lock."""
+        self._offset = read_rows(f, self._offset, self.on_row)
+
+    def refresh(self):
+        """Picks up rows appended by other sessions or processes since the last read."""
+        with self._mutex, open(self.path, "rb") as f:
+            with file_lock(f, exclusive=False):
+                self._read_new_rows(f)
+
+    def append(self, row):
+        """Atomically appends one row; O(1) in the size of the file."""
+        buffer = io.StringIO()
+        csv.writer(buffer, lineterminator="\n").writerow(row)
+        line = buffer.getvalue().encode("utf-8")
+        with self._mutex, open(self.path, "r+b") as f:
+            with file_lock(f):
+                # Catch up first so rows from other processes are not skipped by the new offset
+                self._read_new_rows(f)
+                f.seek(0, os.SEEK_END)
+                f.write(line)
+                f.flush()
+                self._unsynced += 1
+                if self._unsynced >= self.fsync_every:
+                    os.fsync(f.fileno())
+                    self._unsynced = 0
+                self._offset = f.tell()
+            self.on_row([str(value) for value in row])
+
+    @property
+    def offset(self):
+        return self._offset
+
+    @property
+    def unsynced(self):
+        """Rows appended through this log since its last fsync."""
+        return self._unsynced
+
+    def checkpoint(self, read_state):
+        """
+        Fsyncs the file, then calls read_state(offset) while no rows are being folded in, so
+        a caller persisting state derived from on_row can save it together with the exact
+        offset it covers, knowing every row up to that offset is on disk.
+        """
+        with self._mutex:
+            self._fsync()
+            return read_state(self._offset)
+
+    def read_last_rows(self, skip=0, limit=50):
+        """
+        Returns up to `limit` rows, newest first, after skipping the `skip` newest rows.
+        The file is read backwards from the end, so a page costs O(skip + limit), not O(file).
+        Rows must not contain quoted newlines.
+        """
+        wanted = skip + limit
+        lines = []
+        with self._mutex, open(self.path, "rb") as f:
+            with file_lock(f, exclusive=False):
+                position = f.seek(0, os.SEEK_END)
+                pending = b""
+                while position > 0 and len(lines) <= wanted:
+                    size = min(CHUNK_SIZE, position)
+                    position -= size
+                    f.seek(position)
+                    pieces = (f.read(size) + pending).split(b"\n")
+                    # The first piece may be the tail of an earlier line; keep it for the next chunk
+                    pending = pieces.pop(0)
+                    lines.extend(piece for piece in reversed(pieces) if piece)
+                if position == 0 and pending:
+                    lines.append(pending)
+        rows = []
+        for line in lines:
+            row = next(csv.reader([line.decode("utf-8")]), None)
+            if row and row != self.header:
+                rows.append(row)
+        return rows[skip:wanted]
+
+    def _fsync(self):
+        """Flushes the file to disk. Caller holds the mutex."""
+        with open(self.path, "rb") as f:
+            os.fsync(f.fileno())
+        self._unsynced = 0
+
+    def sync(self):
+        """Forces rows appended since the last batch boundary to disk."""
+        with self._mutex:
+            if self._unsynced:
+                self._fsync()
@@ -1,8 +1,16 @@
 import streamlit as st
 import random
-import time
 import pandas as pd
 import plotly.express as px
+from day12_engine import Board, perfect_moves
+from day12_kinarow import MAX_SIZE, MIN_SIZE, KInARowBoard
+
+# Per-move thinking time for the computer on boards larger than 3x3 (seconds)
+SEARCH_BUDGET = 0.5
+QUICK_SEARCH_BUDGET = 0.1
+# How long the browser shows the computer "thinking" before revealing its move (seconds).
+# The move itself is computed immediately; the pause is purely a CSS animation.
+THINKING_DELAY = 0.5
 
 # Page configuration
 st.set_page_config(
@@ -180,8 +188,13 @@ st.markdown("""
 
 # Initialize session state
 def init_session_state():
+    if 'board_size' not in st.session_state:
+        st.session_state.board_size = 3
+    # The number in a row to win lives outside the widget, so it survives the widget being hidden on 3x3
+    if 'win_length' not in st.session_state:
+        st.session_state.win_length = default_win_length(st.session_state.board_size)
     if 'board' not in st.session_state:
-        st.session_state.board = [['' for _ in range(3)] for _ in range(3)]
+        st.session_state.board = new_board()
     if 'current_player' not in st.session_state:
         st.session_state.current_player = 'X'
     if 'game_over' not in st.session_state:
@@ -207,10 +220,34 @@ def init_session_state():
         }
     if 'move_history' not in st.session_state:
         st.session_state.move_history = []
+    if 'computer_reveal' not in st.session_state:
+        st.session_state.computer_reveal = None
+
+def default_win_length(size):
+    """Five in a row (gomoku) on boards that fit it, otherwise the whole side"""
+    return min(5, size)
+
+def new_board():
+    """Classic 3x3 uses the bitboard engine; larger boards play K-in-a-row"""
+    size = st.session_state.board_size
+    if size == 3:
+        return Board()
+    return KInARowBoard(size, min(st.session_state.win_length, size))
+
+def change_board_size():
+    """A new board size starts a new game with the default number in a row"""
+    st.session_state.win_length = default_win_length(st.session_state.board_size)
+    reset_board()
+
+def change_win_length():
+    """Keeps the chosen number in a row and starts a new game"""
+    st.session_state.win_length = st.session_state.win_length_input
+    reset_board()
 
 def reset_board():
     """Reset the game board"""
-    st.session_state.board = [['' for _ in range(3)] for _ in range(3)]
+    st.session_state.board = new_board()
+    st.session_state.computer_reveal = None
     st.session_state.current_player = 'X'
     st.session_state.game_over = False
     st.session_state.winner = None
@@ -219,39 +256,15 @@ def reset_board():
 
 def check_winner():
     """Check if there's a winner and return winner and winning line"""
-    board = st.session_state.board
-    
-    # Check rows
-    for i in range(3):
-        if board[i][0] == board[i][1] == board[i][2] != '':
-            return board[i][0], [(i, 0), (i, 1), (i, 2)]
-    
-    # Check columns
-    for j in range(3):
-        if board[0][j] == board[1][j] == board[2][j] != '':
-            return board[0][j], [(0, j), (1, j), (2, j)]
-    
-    # Check diagonals
-    if board[0][0] == board[1][1] == board[2][2] != '':
-        return board[0][0], [(0, 0), (1, 1), (2, 2)]
-    
-    if board[0][2] == board[1][1] == board[2][0] != '':
-        return board[0][2], [(0, 2), (1, 1), (2, 0)]
-    
-    return None, []
+    return st.session_state.board.winner()
 
 def is_board_full():
     """Check if the board is full"""
-    return all(cell != '' for row in st.session_state.board for cell in row)
+    return st.session_state.board.is_full()
 
 def get_empty_cells():
     """Get list of empty cells"""
-    empty = []
-    for i in range(3):
-        for j in range(3):
-            if st.session_state.board[i][j] == '':
-                empty.append((i, j))
-    return empty
+    return st.session_state.board.empty_cells()
 
 def computer_move():
     """Make computer move based on difficulty"""
@@ -272,11 +285,16 @@ def computer_move():
             move = random.choice(empty_cells)
     
     else:  # hard
-        # Always strategic
-        move = get_best_move() or random.choice(empty_cells)
+        board = st.session_state.board
+        if isinstance(board, Board):
+            # Perfect play from the precomputed solver table; never loses
+            move = random.choice(perfect_moves(board))
+        else:
+            # Time-bounded iterative-deepening search
+            move = board.best_move(st.session_state.current_player, SEARCH_BUDGET)
     
     if move:
-        st.session_state.board[move[0]][move[1]] = st.session_state.current_player
+        st.session_state.board.place(move[0], move[1], st.session_state.current_player)
         st.session_state.move_history.append({
             'player': st.session_state.current_player,
             'position': move,
@@ -287,39 +305,29 @@ def get_best_move():
     """Get best strategic move for computer"""
     board = st.session_state.board
     
-    # Try to win
-    for i in range(3):
-        for j in range(3):
-            if board[i][j] == '':
-                board[i][j] = 'O'
-                winner, _ = check_winner()
-                board[i][j] = ''
-                if winner == 'O':
-                    return (i, j)
-    
-    # Try to block player from winning
-    for i in range(3):
-        for j in range(3):
-            if board[i][j] == '':
-                board[i][j] = 'X'
-                winner, _ = check_winner()
-                board[i][j] = ''
-                if winner == 'X':
-                    return (i, j)
+    # Try to win, then block the player from winning (bitboard lookups, no board mutation)
+    for player in ('O', 'X'):
+        moves = board.winning_moves(player)
+        if moves:
+            return moves[0]
+    
+    # Larger boards: a short, shallow search instead of the 3x3 center/corner/side rules
+    if not isinstance(board, Board):
+        return board.best_move('O', QUICK_SEARCH_BUDGET, max_depth=2)
     
     # Take center if available
-    if board[1][1] == '':
+    if board[1, 1] == '':
         return (1, 1)
     
     # Take corners
     corners = [(0, 0), (0, 2), (2, 0), (2, 2)]
-    available_corners = [corner for corner in corners if board[corner[0]][corner[1]] == '']
+    available_corners = [corner for corner in corners if board[corner] == '']
     if available_corners:
         return random.choice(available_corners)
     
     # Take sides
     sides = [(0, 1), (1, 0), (1, 2), (2, 1)]
-    available_sides = [side for side in sides if board[side[0]][side[1]] == '']
+    available_sides = [side for side in sides if board[side] == '']
     if available_sides:
         return random.choice(available_sides)
     
@@ -327,8 +335,8 @@ def get_best_move():
 
 def make_move(row, col):
     """Make a move on the board"""
-    if st.session_state.board[row][col] == '' and not st.session_state.game_over:
-        st.session_state.board[row][col] = st.session_state.current_player
+    if st.session_state.board[row, col] == '' and not st.session_state.game_over:
+        st.session_state.board.place(row, col, st.session_state.current_player)
         st.session_state.move_history.append({
             'player': st.session_state.current_player,
             'position': (row, col),
@@ -356,8 +364,9 @@ def make_move(row, col):
                 st.session_state.current_player == 'O' and 
                 not st.session_state.game_over):
                 
-                time.sleep(0.5)  # Brief pause for better UX
                 computer_move()
+                # Revealed after a client-side pause instead of blocking the server with a sleep
+                st.session_state.computer_reveal = st.session_state.move_history[-1]['position']
                 
                 # Check for winner after computer move
                 winner, winning_line = check_winner()
@@ -426,9 +435,13 @@ with col_setup2:
 
 with col_setup3:
     st.markdown("#### 🎲 Game Controls")
-    if st.button("🆕 New Game", use_container_width=True, type="primary"):
-        reset_board()
-        st.rerun()
+    # Changing the board starts a new game
+    st.slider("Board size:", MIN_SIZE, MAX_SIZE, key="board_size", on_change=change_board_size)
+    if st.session_state.board_size > 3:
+        st.session_state.win_length_input = min(st.session_state.win_length, st.session_state.board_size)
+        st.number_input("In a row to win:", MIN_SIZE, st.session_state.board_size,
+                        key="win_length_input", on_change=change_win_length)
+    st.button("🆕 New Game", use_container_width=True, type="primary", on_click=reset_board)
     
     if st.button("📊 Reset Stats", use_container_width=True, type="secondary"):
         st.session_state.game_stats = {
@@ -491,15 +504,33 @@ with col_game2:
     
     st.markdown(f'<div class="{status_class}">{status_text}</div>', unsafe_allow_html=True)
     
+    # The computer's latest move is already on the board; the browser hides it behind a short
+    # "thinking" banner and keeps the grid unclickable until it appears. Shown once per move.
+    reveal = st.session_state.computer_reveal
+    st.session_state.computer_reveal = None
+    if reveal is not None:
+        st.markdown(f"""
+        <style>
+            @keyframes computer-thinking {{ from {{ visibility: hidden; }} }}
+            @keyframes thinking-done {{ to {{ visibility: hidden; height: 0; margin: 0; padding: 0; }} }}
+            @keyframes board-locked {{ from {{ pointer-events: none; }} }}
+            .st-key-cell_{reveal[0]}_{reveal[1]} button p {{ animation: computer-thinking {THINKING_DELAY}s step-end; }}
+            [class*="st-key-cell_"] button {{ animation: board-locked {THINKING_DELAY}s step-end; }}
+            .computer-thinking {{ animation: thinking-done 0s {THINKING_DELAY}s forwards; }}
+        </style>
+        <div class="game-status status-playing computer-thinking">🤖 Computer is thinking...</div>
+        """, unsafe_allow_html=True)
+    
     # Game board
     st.markdown("### 🎯 Game Board")
     
-    # Create 3x3 grid of buttons
-    for i in range(3):
-        cols = st.columns(3)
-        for j in range(3):
+    # Create the grid of buttons
+    size = st.session_state.board_size
+    for i in range(size):
+        cols = st.columns(size)
+        for j in range(size):
             with cols[j]:
-                cell_value = st.session_state.board[i][j]
+                cell_value = st.session_state.board[i, j]
                 
                 # Determine cell styling
                 if (i, j) in st.session_state.winning_line:
@@ -629,10 +660,10 @@ st.markdown("### 📚 How to Play & Tips")
 col_rules1, col_rules2, col_rules3 = st.columns(3)
 
 with col_rules1:
-    st.markdown("""
+    st.markdown(f"""
     #### 📖 Rules
     - Players take turns placing ❌ and ⭕
-    - First to get 3 in a row wins
+    - First to get {st.session_state.win_length} in a row wins
     - Rows, columns, or diagonals count
     - If board fills with no winner, it's a draw
     """)
@@ -0,0 +1,206 @@
+"""
+Bitboard tic-tac-toe engine for day12.
+A position is two 9-bit integers, one per player, with bit (row * 3 + col) set for each
+occupied cell. The 8 winning lines are precomputed masks, so checking for a win is at
+most eight ANDs and trying a move never mutates the real board.
+
+Perfect play is solved once at import: a negamax/alpha-beta search over every reachable
+position, sharing a transposition table keyed by the canonical form under the board's
+8 symmetries. Choosing a move afterwards is a table lookup, never a search.
+"""
+
+SIZE = 3
+CELLS = SIZE * SIZE
+FULL = (1 << CELLS) - 1
+PLAYERS = ('X', 'O')
+
+WIN_LINES = (
+    [[(i, j) for j in range(SIZE)] for i in range(SIZE)]                # rows
+    + [[(i, j) for i in range(SIZE)] for j in range(SIZE)]              # columns
+    + [[(i, i) for i in range(SIZE)], [(i, SIZE - 1 - i) for i in range(SIZE)]]  # diagonals
+)
+WIN_MASKS = tuple(sum(1 << (i * SIZE + j) for i, j in line) for line in WIN_LINES)
+
+
+def bit(row, col):
+    return 1 << (row * SIZE + col)
+
+
+def cells_of(mask):
+    """The (row, col) cells set in a mask, in reading order."""
+    return [divmod(i, SIZE) for i in range(CELLS) if mask >> i & 1]
+
+
+def winning_mask(bits):
+    """The first win mask fully covered by a player's bits, or 0."""
+    for mask in WIN_MASKS:
+        if bits & mask == mask:
+            return mask
+    return 0
+
+
+def other(player):
+    return 'O' if player == 'X' else 'X'
+
+
+class Board:
+    """A 3x3 board as two bitboards. board[row, col] reads a cell as 'X', 'O' or ''."""
+
+    __slots__ = ('x', 'o')
+
+    def __init__(self, x=0, o=0):
+        self.x = x
+        self.o = o
+
+    def bits(self, player):
+        return self.x if player == 'X' else self.o
+
+    def __getitem__(self, position):
+        b = bit(*position)
+        return 'X' if self.x & b else ('O' if self.o & b else '')
+
+    def place(self, row, col, player):
+        if player == 'X':
+            self.x |= bit(row, col)
+        else:
+            self.o |= bit(row, col)
+
+    @property
+    def empty(self):
+        """Bitmask of empty cells."""
+        return FULL & ~(self.x | self.o)
+
+    def empty_cells(self):
+        return cells_of(self.empty)
+
+    def is_full(self):
+        return (self.x | self.o) == FULL
+
+    def winner(self):
+        """(player, winning cells) if someone has three in a row, else (None, [])."""
+        for player in PLAYERS:
+            mask = winning_mask(self.bits(player))
+            if mask:
+                return player, cells_of(mask)
+        return None, []
+
+    def winning_moves(self, player):
+        """Empty cells that would complete a line for `player`."""
+        bits, empty = self.bits(player), self.empty
+        return [
+            divmod(i, SIZE) for i in range(CELLS)
+            if empty >> i & 1 and winning_mask(bits | 1 << i)
+        ]
+
+    def copy(self):
+        return Board(self.x, self.o)
+
+
+# --- Perfect play ---
+# The 8 symmetries of the square, each as a permutation of cell indices, and for each one
+# a table mapping every 9-bit mask to its image, so transforming a bitboard is one lookup.
+
+def _symmetry(transform):
+    return tuple(
+        (lambda r, c: r * SIZE + c)(*transform(*divmod(i, SIZE))) for i in range(CELLS)
+    )
+
+
+_N = SIZE - 1
+SYMMETRIES = tuple(_symmetry(t) for t in (
+    lambda r, c: (r, c), lambda r, c: (c, _N - r), lambda r, c: (_N - r, _N - c), lambda r, c: (_N - c, r),
+    lambda r, c: (r, _N - c), lambda r, c: (_N - r, c), lambda r, c: (c, r), lambda r, c: (_N - c, _N - r),
+))
+SYMMETRY_TABLES = tuple(
+    tuple(sum(1 << perm[i] for i in range(CELLS) if mask >> i & 1) for mask in range(1 << CELLS))
+    for perm in SYMMETRIES
+)
+
+
+def _invert(table):
+    inverse = [0] * len(table)
+    for mask, image in enumerate(table):
+        inverse[image] = mask
+    return tuple(inverse)
+
+
+INVERSE_TABLES = tuple(_invert(table) for table in SYMMETRY_TABLES)
+
+EXACT, LOWER, UPPER = range(3)
+
+
+def canonical(x, o):
+    """(key, symmetry index) of the smallest image of the position under the 8 symmetries."""
+    return min((table[x] << CELLS | table[o], s) for s, table in enumerate(SYMMETRY_TABLES))
+
+
+def negamax(me, them, alpha=-CELLS - 1, beta=CELLS + 1, table=None):
+    """
+    Value of the position for the player to move (`me`): positive wins, negative loses,
+    0 draws; quicker wins score higher. Alpha-beta search with a transposition table keyed
+    by the canonical form, so symmetric positions are only searched once.
+    """
+    if winning_mask(them):
+        return -(1 + bin(FULL & ~(me | them)).count('1'))
+    empty = FULL & ~(me | them)
+    if not empty:
+        return 0
+    table = {} if table is None else table
+    key = canonical(me, them)[0]
+    entry = table.get(key)
+    if entry is not None:
+        value, flag = entry
+        if flag == EXACT or (flag == LOWER and value >= beta) or (flag == UPPER and value <= alpha):
+            return value
+    original_alpha = alpha
+    best = -CELLS - 1
+    for i in range(CELLS):
+        if empty >> i & 1:
+            best = max(best, -negamax(them, me | 1 << i, -beta, -alpha, table))
+            alpha = max(alpha, best)
+            if alpha >= beta:
+                break
+    flag = UPPER if best <= original_alpha else (LOWER if best >= beta else EXACT)
+    table[key] = (best, flag)
+    return best
+
+
+def _build_optimal_moves():
+    """
+    Solves every position reachable from the empty board (up to symmetry) and maps each
+    canonical position to the mask of moves that keep the best achievable result.
+    """
+    table = {}
+    optimal = {}
+    pending = [(0, 0)]
+    while pending:
+        x, o = pending.pop()
+        key = canonical(x, o)[0]
+        if key in optimal or winning_mask(x) or winning_mask(o):
+            continue
+        empty = FULL & ~(x | o)
+        if not empty:
+            continue
+        # X moves first, so X is to move whenever both have played the same number of times
+        x_to_move = bin(x).count('1') == bin(o).count('1')
+        me, them = (x, o) if x_to_move else (o, x)
+        values = {}
+        for i in range(CELLS):
+            if empty >> i & 1:
+                values[i] = -negamax(them, me | 1 << i, table=table)
+                pending.append((x | 1 << i, o) if x_to_move else (x, o | 1 << i))
+        best = max(values.values())
+        # Store the moves in the canonical orientation so each symmetric family needs one entry
+        s = canonical(x, o)[1]
+        optimal[key] = SYMMETRY_TABLES[s][sum(1 << i for i, value in values.items() if value == best)]
+    return optimal
+
+
+# Precomputed once at import: canonical position -> mask of optimal moves
+OPTIMAL_MOVES = _build_optimal_moves()
+
+
+def perfect_moves(board):
+    """All optimal moves for the player to move, as (row, col) cells; O(1) table lookups."""
+    key, s = canonical(board.x, board.o)
+    return cells_of(INVERSE_TABLES[s][OPTIMAL_MOVES[key]])
@@ -0,0 +1,266 @@
+"""
+N x N, K-in-a-row (gomoku-style) boards for day12, from 3x3 up to 15x15.
+
+Every run of K cells in any direction is a "window". Each window keeps a count of X and O
+stones, so placing or removing a stone updates only the windows through that cell, and
+with them a running threat score: a window holding c stones of one player and none of
+the other is worth 10**c to that player. Wins and forced blocks fall out of the same
+counts.
+
+The computer searches with iterative deepening negamax and alpha-beta pruning, ordering
+moves by the threat each creates or blocks. A Zobrist-hashed transposition table carries
+best moves between iterations, and a wall-clock budget bounds each move: when time runs
+out the search returns the best move of the last finished depth.
+
+Usage: python day12_kinarow.py [--size 15] [--k 5] [--budget 0.5]
+"""
+import argparse
+import random
+import time
+
+MIN_SIZE = 3
+MAX_SIZE = 15
+EMPTY, X, O = 0, 1, 2
+SYMBOLS = {X: 'X', O: 'O'}
+PIECES = {'X': X, 'O': O}
+WIN_SCORE = 10 ** 12
+DIRECTIONS = ((0, 1), (1, 0), (1, 1), (1, -1))
+BEAM_WIDTH = 12         # moves searched per node on large boards, best-ordered first
+NEIGHBOURHOOD = 2       # candidate moves lie within this distance of an existing stone
+
+EXACT, LOWER, UPPER = range(3)
+
+
+class SearchTimeout(Exception):
+    """Raised inside the search when the move's time budget is spent."""
+
+
+class KInARowBoard:
+    """
+    A size x size board won by K in a row. Offers the same interface as the 3x3 bitboard
+    Board (board[row, col], place, empty_cells, is_full, winner, winning_moves), so day12
+    renders and plays either one the same way, plus best_move() for the computer.
+    """
+
+    def __init__(self, size=3, k=3):
+        if not MIN_SIZE <= size <= MAX_SIZE:
+            raise ValueError(f"Board size must be between {MIN_SIZE} and {MAX_SIZE}")
+        if not MIN_SIZE <= k <= size:
+            raise ValueError(f"K must be between {MIN_SIZE} and the board size")
+        self.size = size
+        self.k = k
+        self.cells = [EMPTY] * (size * size)
+        self.windows = []
+        for row in range(size):
+            for col in range(size):
+                for dr, dc in DIRECTIONS:
+                    end_row, end_col = row + dr * (k - 1), col + dc * (k - 1)
+                    if 0 <= end_row < size and 0 <= end_col < size:
+                        self.windows.append(tuple((row + dr * i) * size + col + dc * i for i in range(k)))
+        self.cell_windows = [[] for _ in self.cells]
+        for w, window in enumerate(self.windows):
+            for i in window:
+                self.cell_windows[i].append(w)
+        self.counts = (None, [0] * len(self.windows), [0] * len(self.windows))     # indexed by X / O
+        self.weights = [0] + [10 ** c for c in range(1, k)] + [WIN_SCORE]
+        self.score = 0          # threat score from X's point of view
+        self.filled = 0
+        self.won = None         # (player, window) once someone completes a window
+        self.hash = 0
+        rng = random.Random(size * 100 + k)
+        self.zobrist = (None, [rng.getrandbits(64) for _ in self.cells], [rng.getrandbits(64) for _ in self.cells])
+        self._history = []
+        self._table = {}
+        self._deadline = None
+        self.depth_reached = 0  # deepest search the last best_move() finished
+
+    # --- Board interface shared with day12_engine.Board ---
+
+    def __getitem__(self, position):
+        row, col = position
+        return SYMBOLS.get(self.cells[row * self.size + col], '')
+
+    def place(self, row, col, player):
+        self._play(row * self.size + col, PIECES[player])
+
+    def empty_cells(self):
+        return [divmod(i, self.size) for i, cell in enumerate(self.cells) if cell == EMPTY]
+
+    def is_full(self):
+        return self.filled == len(self.cells)
+
+    def winner(self):
+        """(player, winning cells) once someone has K in a row, else (None, [])."""
+        if self.won is None:
+            return None, []
+        player, w = self.won
+        return SYMBOLS[player], [divmod(i, self.size) for i in self.windows[w]]
+
+    def winning_moves(self, player):
+        """Empty cells that would complete K in a row for `player`."""
+        me, them = PIECES[player], 3 - PIECES[player]
+        moves = set()
+        for w, window in enumerate(self.windows):
+            if self.counts[me][w] == self.k - 1 and self.counts[them][w] == 0:
+                moves.update(i for i in window if self.cells[i] == EMPTY)
+        return [divmod(i, self.size) for i in sorted(moves)]
+
+    # --- Incremental updates ---
+
+    def _value(self, w):
+        x, o = self.counts[X][w], self.counts[O][w]
+        if x and o:
+            return 0
+        return self.weights[x] if x else -self.weights[o]
+
+    def _play(self, i, player):
+        counts = self.counts[player]
+        self._history.append((i, self.won))
+        for w in self.cell_windows[i]:
+            self.score -= self._value(w)
+            counts[w] += 1
+            self.score += self._value(w)
+            if counts[w] == self.k and self.won is None:
+                self.won = (player, w)
+        self.cells[i] = player
+        self.filled += 1
+        self.hash ^= self.zobrist[player][i]
+
+    def _undo(self):
+        i, self.won = self._history.pop()
+        player = self.cells[i]
+        counts = self.counts[player]
+        for w in self.cell_windows[i]:
+            self.score -= self._value(w)
+            counts[w] -= 1
+            self.score += self._value(w)
+        self.cells[i] = EMPTY
+        self.filled -= 1
+        self.hash ^= self.zobrist[player][i]
+
+    # --- Search ---
+
+    def _candidates(self, player):
+        """Empty cells near existing stones, ordered by the threat they make plus the one they block."""
+        if self.filled == 0:
+            return [(self.size // 2) * self.size + self.size // 2]
+        size, cells = self.size, self.cells
+        near = set()
+        for i, cell in enumerate(cells):
+            if cell != EMPTY:
+                row, col = divmod(i, size)
+                for r in range(max(0, row - NEIGHBOURHOOD), min(size, row + NEIGHBOURHOOD + 1)):
+                    for c in range(max(0, col - NEIGHBOURHOOD), min(size, col + NEIGHBOURHOOD + 1)):
+                        if cells[r * size + c] == EMPTY:
+                            near.add(r * size + c)
+        mine, theirs = self.counts[player], self.counts[3 - player]
+        weights = self.weights
+
+        def threat(i):
+            gain = 0
+            for w in self.cell_windows[i]:
+                if not theirs[w]:
+                    gain += weights[mine[w] + 1] - weights[mine[w]]
+                if not mine[w]:
+                    gain += weights[theirs[w] + 1] - weights[theirs[w]]
+            return gain
+
+        return sorted(near, key=threat, reverse=True)
+
+    def _negamax(self, player, depth, alpha, beta):
+        if time.perf_counter() > self._deadline:
+            raise SearchTimeout
+        if self.won is not None:
+            # The previous move won; losing later is better than losing now
+            return -(WIN_SCORE + depth)
+        if self.filled == len(self.cells):
+            return 0
+        if depth == 0:
+            return self.score if player == X else -self.score
+
+        key = (self.hash, player)
+        entry = self._table.get(key)
+        tt_move = None
+        if entry is not None:
+            entry_depth, value, flag, tt_move = entry
+            if entry_depth >= depth and (
+                flag == EXACT or (flag == LOWER and value >= beta) or (flag == UPPER and value <= alpha)
+            ):
+                return value
+
+        moves = self._candidates(player)
+        if len(self.cells) > 9:
+            moves = moves[:BEAM_WIDTH]
+        if tt_move is not None and tt_move in moves:
+            moves.remove(tt_move)
+            moves.insert(0, tt_move)
+
+        original_alpha = alpha
+        best, best_move = -WIN_SCORE * 2, moves[0]
+        for i in moves:
+            self._play(i, player)
+            try:
+                value = -self._negamax(3 - player, depth - 1, -beta, -alpha)
+            finally:
+                self._undo()
+            if value > best:
+                best, best_move = value, i
+            alpha = max(alpha, value)
+            if alpha >= beta:
+                break
+        flag = UPPER if best <= original_alpha else (LOWER if best >= beta else EXACT)
+        self._table[key] = (depth, best, flag, best_move)
+        return best
+
+    def best_move(self, player, budget=0.5, max_depth=None):
+        """
+        The computer's move for `player` as (row, col), searched by iterative deepening for
+        at most `budget` seconds of wall-clock time (or up to `max_depth` plies).
+        """
+        player = PIECES[player]
+        moves = self._candidates(player)
+        best = moves[0]
+        max_depth = max_depth or len(self.cells) - self.filled
+        self._deadline = time.perf_counter() + budget
+        self._table.clear()
+        self.depth_reached = 0
+        for depth in range(1, max_depth + 1):
+            try:
+                value = self._negamax(player, depth, -WIN_SCORE * 2, WIN_SCORE * 2)
+            except SearchTimeout:
+                break
+            best = self._table[self.hash, player][3]
+            self.depth_reached = depth
+            if abs(value) >= WIN_SCORE:
+                break   # the game is decided either way; deeper search cannot change the move
+        return divmod(best, self.size)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=15)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--budget", type=float, default=0.5, help="seconds per move")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    # Computer (X) against a random opponent (O) that blocks immediate wins
+    rng = random.Random(args.seed)
+    board = KInARowBoard(args.size, args.k)
+    player, worst = 'X', 0.0
+    while board.winner()[0] is None and not board.is_full():
+        if player == 'X':
+            start = time.perf_counter()
+            move = board.best_move('X', args.budget)
+            elapsed = time.perf_counter() - start
+            worst = max(worst, elapsed)
+            print(f"X {move} depth {board.depth_reached} in {elapsed * 1000:.0f} ms")
+        else:
+            move = (board.winning_moves('O') or board.winning_moves('X') or [rng.choice(board.empty_cells())])[0]
+        board.place(*move, player)
+        player = 'O' if player == 'X' else 'X'
+    print(f"winner: {board.winner()[0] or 'draw'}  slowest move: {worst * 1000:.0f} ms (budget {args.budget * 1000:.0f} ms)")
+
+
+if __name__ == "__main__":
+    main()
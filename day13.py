@@ -1,10 +1,14 @@
 import streamlit as st
-import random
 import time
+import numpy as np
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime
+from day13_engine import (
+    CHOICES, MOVES, NEW_SCORES, PLAYER, GameHistory, MarkovOpponent, Scores,
+    determine_winner, random_choice, score_round
+)
 
 # Page configuration
 st.set_page_config(
@@ -260,13 +264,6 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-# Game choices with emojis
-CHOICES = {
-    'rock': {'emoji': '🗿', 'name': 'Rock', 'beats': 'scissors'},
-    'paper': {'emoji': '📄', 'name': 'Paper', 'beats': 'rock'},
-    'scissors': {'emoji': '✂️', 'name': 'Scissors', 'beats': 'paper'}
-}
-
 # Initialize session state
 def init_session_state():
     if 'player_score' not in st.session_state:
@@ -287,79 +284,65 @@ def init_session_state():
         st.session_state.game_result = None
     if 'show_result' not in st.session_state:
         st.session_state.show_result = False
+    if 'history_capacity' not in st.session_state:
+        st.session_state.history_capacity = 50
     if 'game_history' not in st.session_state:
-        st.session_state.game_history = []
+        st.session_state.game_history = GameHistory(st.session_state.history_capacity)
     if 'win_streak' not in st.session_state:
         st.session_state.win_streak = 0
     if 'best_streak' not in st.session_state:
         st.session_state.best_streak = 0
     if 'computer_streak' not in st.session_state:
         st.session_state.computer_streak = 0
+    if 'difficulty' not in st.session_state:
+        st.session_state.difficulty = 'Random'
+    if 'opponent' not in st.session_state:
+        st.session_state.opponent = MarkovOpponent()
 
+# Game rules and scoring live in day13_engine; these wrappers keep st.session_state in step
 def get_computer_choice():
-    """Get computer's random choice"""
-    return random.choice(list(CHOICES.keys()))
-
-def determine_winner(player_choice, computer_choice):
-    """Determine the winner of the round"""
-    if player_choice == computer_choice:
-        return 'draw'
-    elif CHOICES[player_choice]['beats'] == computer_choice:
-        return 'player'
-    else:
-        return 'computer'
+    """Get computer's choice: random, or countering the player's predicted move when adaptive"""
+    if st.session_state.difficulty == 'Adaptive':
+        return st.session_state.opponent.choose()
+    return random_choice()
 
 def update_scores(result):
     """Update game scores and statistics"""
-    st.session_state.total_games += 1
+    scores = score_round(Scores(*(st.session_state[field] for field in Scores._fields)), result)
+    for field, value in zip(Scores._fields, scores):
+        st.session_state[field] = value
     st.session_state.current_round += 1
-    
-    if result == 'player':
-        st.session_state.player_score += 1
-        st.session_state.win_streak += 1
-        st.session_state.computer_streak = 0
-        
-        if st.session_state.win_streak > st.session_state.best_streak:
-            st.session_state.best_streak = st.session_state.win_streak
-            
-    elif result == 'computer':
-        st.session_state.computer_score += 1
-        st.session_state.computer_streak += 1
-        st.session_state.win_streak = 0
-    else:  # draw
-        st.session_state.draws += 1
 
 def save_game_to_history(player_choice, computer_choice, result):
-    """Save current game to history"""
-    st.session_state.game_history.append({
-        'round': st.session_state.current_round,
-        'player_choice': player_choice,
-        'computer_choice': computer_choice,
-        'result': result,
-        'timestamp': datetime.now(),
-        'player_score_after': st.session_state.player_score,
-        'computer_score_after': st.session_state.computer_score
-    })
-    
-    # Keep only last 50 games
-    if len(st.session_state.game_history) > 50:
-        st.session_state.game_history = st.session_state.game_history[-50:]
+    """Save current game to history (a ring buffer: the oldest round drops out when full)"""
+    st.session_state.game_history.append(
+        round=st.session_state.current_round,
+        player_choice=player_choice,
+        computer_choice=computer_choice,
+        result=result,
+        timestamp=datetime.now().timestamp(),
+        player_score_after=st.session_state.player_score,
+        computer_score_after=st.session_state.computer_score
+    )
+
+def resize_history():
+    """Apply a new retention window, keeping the most recent rounds"""
+    st.session_state.game_history = st.session_state.game_history.resized(st.session_state.history_capacity)
 
 def reset_game():
     """Reset all game statistics"""
-    st.session_state.player_score = 0
-    st.session_state.computer_score = 0
-    st.session_state.draws = 0
-    st.session_state.total_games = 0
+    for field, value in zip(Scores._fields, NEW_SCORES):
+        st.session_state[field] = value
     st.session_state.current_round = 0
     st.session_state.player_choice = None
     st.session_state.computer_choice = None
     st.session_state.game_result = None
     st.session_state.show_result = False
-    st.session_state.game_history = []
+    st.session_state.game_history = GameHistory(st.session_state.history_capacity)
     st.session_state.win_streak = 0
     st.session_state.best_streak = 0
     st.session_state.computer_streak = 0
+    st.session_state.opponent = MarkovOpponent()
 
 def play_round(player_choice):
     """Play a round of the game"""
@@ -373,10 +356,20 @@ def play_round(player_choice):
     
     update_scores(result)
     save_game_to_history(player_choice, computer_choice, result)
+    # The model keeps learning in either mode, so switching to Adaptive is effective at once
+    st.session_state.opponent.observe(player_choice)
 
 # Initialize session state
 init_session_state()
 
+# Opponent difficulty
+with st.sidebar:
+    st.markdown("### 🤖 Computer Opponent")
+    st.radio("Difficulty", ['Random', 'Adaptive'], key='difficulty',
+             help="Adaptive learns your recent move patterns and plays the counter to your likely next move.")
+    st.number_input("History window (rounds)", min_value=10, max_value=5_000_000, step=50,
+                    key='history_capacity', on_change=resize_history)
+
 # Main header
 st.markdown('<h1 class="main-header">🗿📄✂️ ROCK PAPER SCISSORS ✂️📄🗿</h1>', unsafe_allow_html=True)
 
@@ -554,8 +547,7 @@ with col_control2:
 with col_control3:
     # Auto-play option
     if st.button("🎲 Random Round", use_container_width=True):
-        random_choice = random.choice(list(CHOICES.keys()))
-        play_round(random_choice)
+        play_round(random_choice())
         st.rerun()
 
 # Statistics section
@@ -608,27 +600,20 @@ if st.session_state.total_games > 0:
             st.plotly_chart(fig_results, use_container_width=True)
     
     with col_chart2:
-        # Choice frequency analysis
-        if st.session_state.game_history:
-            choice_counts = {}
-            computer_choice_counts = {}
-            
-            for game in st.session_state.game_history:
-                player_choice = game['player_choice']
-                computer_choice = game['computer_choice']
-                
-                choice_counts[player_choice] = choice_counts.get(player_choice, 0) + 1
-                computer_choice_counts[computer_choice] = computer_choice_counts.get(computer_choice, 0) + 1
+        # Choice frequency analysis, straight from the history's running counts
+        history = st.session_state.game_history
+        if len(history):
+            choice_data = [
+                {
+                    'Choice': f"{CHOICES[choice]['emoji']} {CHOICES[choice]['name']}",
+                    'Your Count': history.player_counts[i],
+                    'Computer Count': history.computer_counts[i]
+                }
+                for i, choice in enumerate(MOVES)
+                if history.player_counts[i] or history.computer_counts[i]
+            ]
             
-            if choice_counts:
-                choice_data = []
-                for choice, count in choice_counts.items():
-                    choice_data.append({
-                        'Choice': f"{CHOICES[choice]['emoji']} {CHOICES[choice]['name']}",
-                        'Your Count': count,
-                        'Computer Count': computer_choice_counts.get(choice, 0)
-                    })
-                
+            if choice_data:
                 choice_df = pd.DataFrame(choice_data)
                 
                 fig_choices = px.bar(
@@ -645,22 +630,13 @@ if st.session_state.total_games > 0:
     if len(st.session_state.game_history) >= 5:
         st.markdown("### 📈 Performance Trend (Last 20 Games)")
         
-        recent_games = st.session_state.game_history[-20:]
-        trend_data = []
-        cumulative_wins = 0
-        
-        for i, game in enumerate(recent_games):
-            if game['result'] == 'player':
-                cumulative_wins += 1
-            
-            win_rate_at_game = (cumulative_wins / (i + 1)) * 100
-            trend_data.append({
-                'Game': i + 1,
-                'Win Rate': win_rate_at_game,
-                'Result': '🎉 Win' if game['result'] == 'player' else ('🤝 Draw' if game['result'] == 'draw' else '😔 Loss')
-            })
-        
-        trend_df = pd.DataFrame(trend_data)
+        recent_results = st.session_state.game_history.column('result', 20)
+        games = np.arange(1, len(recent_results) + 1)
+        trend_df = pd.DataFrame({
+            'Game': games,
+            'Win Rate': np.cumsum(recent_results == PLAYER) / games * 100,
+            'Result': np.array(['🤝 Draw', '🎉 Win', '😔 Loss'])[recent_results]
+        })
         
         fig_trend = px.line(
             trend_df,
@@ -673,12 +649,12 @@ if st.session_state.total_games > 0:
         st.plotly_chart(fig_trend, use_container_width=True)
 
 # Recent game history
-if st.session_state.game_history:
+if len(st.session_state.game_history):
     st.markdown("---")
     st.markdown("### 📜 Recent Games")
     
     # Show last 10 games
-    recent_games = list(reversed(st.session_state.game_history[-10:]))
+    recent_games = list(reversed(st.session_state.game_history.recent(10)))
     
     for game in recent_games:
         result_emoji = '🎉' if game['result'] == 'player' else ('🤝' if game['result'] == 'draw' else '😔')
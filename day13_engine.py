@@ -0,0 +1,215 @@
+"""
+Stateless rock-paper-scissors engine for day13, usable without Streamlit.
+Outcomes come from a table precomputed at import, and play_many() scores whole arrays of
+rounds with one NumPy lookup, for tournament simulation and bot testing.
+"""
+import random
+from collections import namedtuple
+
+import numpy as np
+
+# Game choices with emojis
+CHOICES = {
+    'rock': {'emoji': '🗿', 'name': 'Rock', 'beats': 'scissors'},
+    'paper': {'emoji': '📄', 'name': 'Paper', 'beats': 'rock'},
+    'scissors': {'emoji': '✂️', 'name': 'Scissors', 'beats': 'paper'}
+}
+
+MOVES = tuple(CHOICES)                       # move code -> name
+MOVE_INDEX = {move: i for i, move in enumerate(MOVES)}
+RESULTS = ('draw', 'player', 'computer')     # result code -> name
+DRAW, PLAYER, COMPUTER = range(3)
+
+# OUTCOME_MATRIX[player, computer] is the result code of that pairing
+OUTCOME_MATRIX = np.array([
+    [DRAW if p == c else (PLAYER if CHOICES[p]['beats'] == c else COMPUTER) for c in MOVES]
+    for p in MOVES
+], dtype=np.int8)
+OUTCOMES = {(p, c): RESULTS[OUTCOME_MATRIX[i, j]] for i, p in enumerate(MOVES) for j, c in enumerate(MOVES)}
+# COUNTER[move] is the move that beats it
+COUNTER = {CHOICES[move]['beats']: move for move in MOVES}
+
+Scores = namedtuple('Scores', [
+    'player_score', 'computer_score', 'draws', 'total_games',
+    'win_streak', 'best_streak', 'computer_streak'
+])
+NEW_SCORES = Scores(0, 0, 0, 0, 0, 0, 0)
+
+
+def random_choice(rng=random):
+    """A uniformly random move."""
+    return rng.choice(MOVES)
+
+
+def determine_winner(player_choice, computer_choice):
+    """'player', 'computer' or 'draw' for one round."""
+    return OUTCOMES[player_choice, computer_choice]
+
+
+def score_round(scores, result):
+    """Returns the scores after one more round with the given result."""
+    if result == 'player':
+        win_streak = scores.win_streak + 1
+        return scores._replace(
+            player_score=scores.player_score + 1, total_games=scores.total_games + 1,
+            win_streak=win_streak, best_streak=max(scores.best_streak, win_streak), computer_streak=0
+        )
+    if result == 'computer':
+        return scores._replace(
+            computer_score=scores.computer_score + 1, total_games=scores.total_games + 1,
+            computer_streak=scores.computer_streak + 1, win_streak=0
+        )
+    return scores._replace(draws=scores.draws + 1, total_games=scores.total_games + 1)
+
+
+class MarkovOpponent:
+    """
+    Adaptive opponent: an order-k Markov model of the player's moves that plays the counter
+    to the move it expects next. The last k moves are packed into one integer context that
+    indexes a table of 3**k slots, so choose() and observe() are O(1) and memory is fixed
+    by the order. Counts decay on every update so recent habits outweigh old ones.
+    """
+
+    def __init__(self, order=2, decay=0.9, rng=random):
+        self.order = order
+        self.decay = decay
+        self.rng = rng
+        self._modulus = len(MOVES) ** order
+        self._context = 0
+        self._seen = 0          # moves observed, until the context is full
+        self._table = [None] * self._modulus    # context -> [count per move]
+
+    def predict(self):
+        """The player's most likely next move, or None if this context is new."""
+        if self._seen < self.order:
+            return None
+        counts = self._table[self._context]
+        if counts is None:
+            return None
+        best = max(counts)
+        return MOVES[self.rng.choice([i for i, count in enumerate(counts) if count == best])]
+
+    def choose(self):
+        """Counters the predicted move; plays randomly while it has nothing to go on."""
+        predicted = self.predict()
+        return random_choice(self.rng) if predicted is None else COUNTER[predicted]
+
+    def observe(self, player_choice):
+        """Learns from the move the player just made."""
+        move = MOVE_INDEX[player_choice]
+        if self._seen >= self.order:
+            counts = self._table[self._context]
+            if counts is None:
+                counts = self._table[self._context] = [0.0] * len(MOVES)
+            for i in range(len(counts)):
+                counts[i] *= self.decay
+            counts[move] += 1.0
+        else:
+            self._seen += 1
+        self._context = (self._context * len(MOVES) + move) % self._modulus
+
+
+class GameHistory:
+    """
+    The last `capacity` rounds in a fixed-size ring buffer of NumPy columns, with result and
+    choice counts over the retained rounds kept up to date as rounds are added and evicted.
+    Adding a round is O(1) and never copies, whatever the capacity.
+    """
+
+    COLUMNS = {
+        'round': np.int64, 'player_choice': np.int8, 'computer_choice': np.int8, 'result': np.int8,
+        'timestamp': np.float64, 'player_score_after': np.int64, 'computer_score_after': np.int64
+    }
+
+    def __init__(self, capacity=50):
+        self.capacity = capacity
+        self._columns = {name: np.zeros(capacity, dtype=dtype) for name, dtype in self.COLUMNS.items()}
+        self._next = 0
+        self._size = 0
+        self.result_counts = [0] * len(RESULTS)         # by result code, over the retained rounds
+        self.player_counts = [0] * len(MOVES)           # by move code
+        self.computer_counts = [0] * len(MOVES)
+
+    def __len__(self):
+        return self._size
+
+    def append(self, round, player_choice, computer_choice, result, timestamp,
+               player_score_after, computer_score_after):
+        """Adds a round (choices and result by name, timestamp in epoch seconds)."""
+        columns = self._columns
+        i = self._next
+        if self._size == self.capacity:
+            # Evict the oldest round from the aggregates before overwriting its slot
+            self.result_counts[columns['result'][i]] -= 1
+            self.player_counts[columns['player_choice'][i]] -= 1
+            self.computer_counts[columns['computer_choice'][i]] -= 1
+        else:
+            self._size += 1
+        player, computer, code = MOVE_INDEX[player_choice], MOVE_INDEX[computer_choice], RESULTS.index(result)
+        columns['round'][i] = round
+        columns['player_choice'][i] = player
+        columns['computer_choice'][i] = computer
+        columns['result'][i] = code
+        columns['timestamp'][i] = timestamp
+        columns['player_score_after'][i] = player_score_after
+        columns['computer_score_after'][i] = computer_score_after
+        self.result_counts[code] += 1
+        self.player_counts[player] += 1
+        self.computer_counts[computer] += 1
+        self._next = (i + 1) % self.capacity
+
+    def _indices(self, n=None):
+        """Slot indices of the last n rounds (all retained by default), oldest first."""
+        n = self._size if n is None else min(n, self._size)
+        return (np.arange(self._next - n, self._next)) % self.capacity
+
+    def column(self, name, n=None):
+        """The last n values of one column, oldest first."""
+        return self._columns[name][self._indices(n)]
+
+    def recent(self, n):
+        """The last n rounds as dicts with choice and result names, oldest first."""
+        indices = self._indices(n)
+        rounds = []
+        for i in indices.tolist():
+            round = {name: column[i].item() for name, column in self._columns.items()}
+            round['player_choice'] = MOVES[round['player_choice']]
+            round['computer_choice'] = MOVES[round['computer_choice']]
+            round['result'] = RESULTS[round['result']]
+            rounds.append(round)
+        return rounds
+
+    def resized(self, capacity):
+        """A copy holding the most recent rounds that fit in the new capacity."""
+        history = GameHistory(capacity)
+        for round in self.recent(capacity):
+            history.append(**round)
+        return history
+
+
+def encode(moves):
+    """Move names (or codes) to an int8 array of move codes."""
+    if isinstance(moves, np.ndarray) and moves.dtype.kind in 'iu':
+        return moves.astype(np.int8, copy=False)
+    return np.fromiter((MOVE_INDEX[move] for move in moves), dtype=np.int8)
+
+
+def play_many(player_choices, computer_choices=None, rng=None):
+    """
+    Scores many rounds at once. Choices may be move names or move codes; missing computer
+    choices are drawn uniformly from `rng` (a numpy Generator). Returns the computer move
+    codes and the result codes (DRAW, PLAYER, COMPUTER) as int8 arrays.
+    """
+    players = encode(player_choices)
+    if computer_choices is None:
+        rng = rng if rng is not None else np.random.default_rng()
+        computers = rng.integers(0, len(MOVES), size=len(players), dtype=np.int8)
+    else:
+        computers = encode(computer_choices)
+    return computers, OUTCOME_MATRIX[players, computers]
+
+
+def tally(results):
+    """Counts of (draws, player wins, computer wins) in an array of result codes."""
+    draws, player, computer = np.bincount(results, minlength=3)
+    return int(draws), int(player), int(computer)
@@ -0,0 +1,231 @@
+"""
+Monte Carlo strategy lab for day13 rock-paper-scissors bots.
+Plays every pair of strategies against each other (round-robin) for a given number of
+rounds, sharded across a process pool, and reports each side's win, draw and loss rates
+with 95% confidence intervals and the rounds/second throughput. Used to pick which
+adaptive opponent to ship.
+
+Each shard is an independent match with its own seed, so adaptive strategies start
+learning afresh per shard; keep shards long enough (the default is 100,000 rounds)
+for that warm-up not to matter. Rounds within a shard are not independent (an adaptive
+bot's moves depend on the ones before), so the intervals come from the spread of the
+per-shard rates (batch means), and need at least two shards per matchup. A strategy's
+overall standing weights its matchups and combines their errors, opponent by opponent.
+
+Usage: python day13_lab.py [--rounds 1000000] [--strategies random frequency markov2 wsls] [--workers 4]
+"""
+import argparse
+import itertools
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from day13_engine import COUNTER, MOVES, MarkovOpponent, determine_winner, random_choice
+
+Z_95 = 1.959964
+# Two-sided 95% Student t critical values for 1 to 30 degrees of freedom; beyond that Z_95
+T_95 = (
+    12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+    2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+    2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042,
+)
+
+
+# --- Strategies ---
+# A strategy picks its next move with choose() and learns from each finished round through
+# observe(own move, opponent's move). Each one is built per match by a factory taking an RNG.
+
+class RandomStrategy:
+    """Uniformly random moves: unexploitable, and unable to exploit anyone."""
+
+    def __init__(self, rng):
+        self.rng = rng
+
+    def choose(self):
+        return random_choice(self.rng)
+
+    def observe(self, own, opponent):
+        pass
+
+
+class FrequencyStrategy:
+    """Counters the move the opponent has played most often so far."""
+
+    def __init__(self, rng):
+        self.rng = rng
+        self.counts = dict.fromkeys(MOVES, 0)
+
+    def choose(self):
+        best = max(self.counts.values())
+        return COUNTER[self.rng.choice([move for move in MOVES if self.counts[move] == best])]
+
+    def observe(self, own, opponent):
+        self.counts[opponent] += 1
+
+
+class MarkovStrategy:
+    """The day13 adaptive opponent: an order-k Markov model of the opponent's moves."""
+
+    def __init__(self, rng, order=2):
+        self.model = MarkovOpponent(order=order, rng=rng)
+
+    def choose(self):
+        return self.model.choose()
+
+    def observe(self, own, opponent):
+        self.model.observe(opponent)
+
+
+class WinStayLoseShiftStrategy:
+    """Repeats a winning move; after a loss plays what beats the opponent's last move; else random."""
+
+    def __init__(self, rng):
+        self.rng = rng
+        self.next_move = None
+
+    def choose(self):
+        return self.next_move or random_choice(self.rng)
+
+    def observe(self, own, opponent):
+        result = determine_winner(own, opponent)
+        if result == 'player':
+            self.next_move = own
+        elif result == 'computer':
+            self.next_move = COUNTER[opponent]
+        else:
+            self.next_move = None
+
+
+STRATEGIES = {
+    "random": RandomStrategy,
+    "frequency": FrequencyStrategy,
+    "markov1": lambda rng: MarkovStrategy(rng, order=1),
+    "markov2": lambda rng: MarkovStrategy(rng, order=2),
+    "markov3": lambda rng: MarkovStrategy(rng, order=3),
+    "wsls": WinStayLoseShiftStrategy,
+}
+
+
+def play_match(first, second, rounds, seed):
+    """Plays one match; returns (first's wins, second's wins, draws)."""
+    rng_first, rng_second = random.Random(seed * 2), random.Random(seed * 2 + 1)
+    a, b = STRATEGIES[first](rng_first), STRATEGIES[second](rng_second)
+    tally = {'player': 0, 'computer': 0, 'draw': 0}
+    for _ in range(rounds):
+        move_a, move_b = a.choose(), b.choose()
+        tally[determine_winner(move_a, move_b)] += 1
+        a.observe(move_a, move_b)
+        b.observe(move_b, move_a)
+    return tally['player'], tally['computer'], tally['draw']
+
+
+def run_shard(job):
+    """Worker entry point: plays one shard and reports how long it took."""
+    first, second, rounds, seed = job
+    start = time.perf_counter()
+    result = play_match(first, second, rounds, seed)
+    return (first, second), result, time.perf_counter() - start
+
+
+def t_95(df):
+    return T_95[df - 1] if df <= len(T_95) else Z_95
+
+
+def batch_estimate(counts, rounds):
+    """
+    Rate and standard error from independent shards, shard i having counts[i] successes
+    in rounds[i] rounds. The error is the spread of the per-shard rates, weighted by shard
+    size; it is nan with fewer than two shards.
+    """
+    total = sum(rounds)
+    rate = sum(counts) / total
+    n = len(rounds)
+    if n < 2:
+        return rate, math.nan
+    variance = sum((r / total) ** 2 * (c / r - rate) ** 2 for c, r in zip(counts, rounds)) * n / (n - 1)
+    return rate, math.sqrt(variance)
+
+
+def round_robin(pool, strategies, rounds, shard_size):
+    """
+    Plays every pair of strategies for `rounds` rounds, split into shards of at most
+    `shard_size` rounds. Returns ({(first, second): [(wins, losses, draws) per shard]}, wall, busy).
+    """
+    jobs = []
+    seeds = itertools.count()
+    for first, second in itertools.combinations(strategies, 2):
+        for start in range(0, rounds, shard_size):
+            jobs.append((first, second, min(shard_size, rounds - start), next(seeds)))
+
+    shards = {pair: [] for pair in itertools.combinations(strategies, 2)}
+    busy = 0.0
+    start = time.perf_counter()
+    for pair, result, elapsed in pool.map(run_shard, jobs):
+        shards[pair].append(result)
+        busy += elapsed
+    return shards, time.perf_counter() - start, busy
+
+
+def format_rate(rate, error, critical):
+    if math.isnan(error):
+        return f"{rate:>6.1%} [n/a]"
+    low, high = max(rate - critical * error, 0.0), min(rate + critical * error, 1.0)
+    return f"{rate:>6.1%} [{low:.1%}, {high:.1%}]"
+
+
+def report(shards, wall, busy):
+    rounds_played = sum(sum(map(sum, results)) for results in shards.values())
+    print(f"{'matchup':<24} {'rounds':>10} {'first wins (95% CI)':>26} {'draws':>26} {'second wins':>26}")
+    # Per matchup and outcome: (rounds, rate, standard error)
+    estimates = {}
+    for (first, second), results in shards.items():
+        rounds = [sum(result) for result in results]
+        wins, losses, draws = (batch_estimate([result[i] for result in results], rounds) for i in range(3))
+        estimates[first, second] = (sum(rounds), wins, losses)
+        critical = t_95(len(results) - 1)
+        print(f"{first + ' vs ' + second:<24} {sum(rounds):>10,} {format_rate(*wins, critical):>26} "
+              f"{format_rate(*draws, critical):>26} {format_rate(*losses, critical):>26}")
+
+    # Overall standing: each strategy's matchups weighted by rounds played, with their
+    # errors combined as independent strata rather than pooling rounds across opponents
+    records = {}
+    for (first, second), (rounds, wins, losses) in estimates.items():
+        records.setdefault(first, []).append((rounds, wins, losses))
+        records.setdefault(second, []).append((rounds, losses, wins))
+
+    def combine(matchups, outcome):
+        total = sum(rounds for rounds, *_ in matchups)
+        rate = sum(rounds / total * estimate[outcome][0] for rounds, *estimate in matchups)
+        error = math.sqrt(sum((rounds / total * estimate[outcome][1]) ** 2 for rounds, *estimate in matchups))
+        return rate, error
+
+    standings = []
+    for name, matchups in records.items():
+        won, lost = combine(matchups, 0), combine(matchups, 1)
+        standings.append((won[0] - lost[0], name, sum(rounds for rounds, *_ in matchups), won, lost))
+    print()
+    print(f"{'strategy':<12} {'rounds':>10} {'win rate (95% CI)':>26} {'loss rate':>26} {'net':>8}")
+    for net, name, rounds, won, lost in sorted(standings, reverse=True):
+        print(f"{name:<12} {rounds:>10,} {format_rate(*won, Z_95):>26} {format_rate(*lost, Z_95):>26} {net:>+8.2%}")
+    print()
+    print(f"rounds/s: {rounds_played / wall:,.0f} wall  ({rounds_played / busy:,.0f} per busy worker)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=1_000_000, help="rounds per matchup")
+    parser.add_argument("--strategies", nargs="+", choices=STRATEGIES, default=list(STRATEGIES))
+    parser.add_argument("--shard-size", type=int, default=100_000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        shards, wall, busy = round_robin(pool, args.strategies, args.rounds, args.shard_size)
+    print(f"strategies={len(args.strategies)} rounds/matchup={args.rounds:,} workers={args.workers}")
+    report(shards, wall, busy)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,17 @@
 import streamlit as st
-import time
-from datetime import timedelta, datetime
-import pandas as pd
-import plotly.graph_objects as go
+import atexit
+import json
 import os
+import uuid
+from datetime import timedelta
+import pandas as pd
+import streamlit.components.v1 as components
+from day14_archive import SessionArchive
+from day14_gauge import live_display_args, write_plotly_bundle
+from day14_journal import JOURNAL_FILE, Journal
+from day14_multi import StopwatchRegistry
+from day14_store import COLUMNS, SessionStore
+from day14_timer import format_ns
 
 # -------------------------------
 # Page Configuration
@@ -14,68 +22,95 @@ st.set_page_config(page_title="Advanced Stopwatch ⏱", page_icon="⏱", layout=
 # CSV Setup for Session History
 # -------------------------------
 DATA_FILE = "stopwatch_sessions.csv"
-if not os.path.exists(DATA_FILE):
-    pd.DataFrame(columns=["session_id", "start_time", "end_time", "duration_seconds"]).to_csv(DATA_FILE, index=False)
+HISTORY_PAGE_SIZE = 50
+LAP_TABLE_ROWS = 100
+
+@st.cache_resource
+def get_store():
+    """One shared append-only session store per server process (creates the CSV if missing)."""
+    session_store = SessionStore(DATA_FILE)
+    # Sessions are fsynced in batches; the last partial batch is flushed when the server exits
+    atexit.register(session_store.sync)
+    return session_store
+
+store = get_store()
+
+@st.cache_resource
+def get_registry():
+    """
+    Every stopwatch in the server process, grouped by board. Stopped sessions are appended
+    to the shared store, so a team board costs no more than one stopwatch per timer.
+    Start/stop/lap/reset are journaled, so running stopwatches survive a server restart,
+    and boards left idle are evicted from memory and reloaded from the journal when reopened.
+    """
+    return StopwatchRegistry(on_stop=store.add_session, journal=Journal(JOURNAL_FILE))
+
+registry = get_registry()
+
+@st.cache_resource
+def get_archive():
+    """Date-partitioned columnar copy of the CSV, queried by date range instead of re-read."""
+    return SessionArchive(DATA_FILE)
 
 # -------------------------------
 # Session State Initialization
 # -------------------------------
-if "start_time" not in st.session_state:
-    st.session_state.start_time = None
-if "elapsed_time" not in st.session_state:
-    st.session_state.elapsed_time = 0.0
-if "running" not in st.session_state:
-    st.session_state.running = False
-if "laps" not in st.session_state:
-    st.session_state.laps = []
-if "session_id" not in st.session_state:
-    st.session_state.session_id = None
+# A session gets a private board until it joins a shared one by name. The board lives in
+# the URL too, so a reload after a server restart finds its journaled stopwatches again.
+if "board" not in st.session_state:
+    st.session_state.board = st.query_params.get("board") or uuid.uuid4().hex[:8]
+if "watch_name" not in st.session_state:
+    st.session_state.watch_name = "Main"
 
 # -------------------------------
 # Stopwatch Functions
 # -------------------------------
+# Timing runs on a monotonic nanosecond clock (LapTimer); wall-clock time is only used
+# to stamp when a session started and ended. Stopping appends the session to the CSV
+# (one locked row, no read-rewrite of the history).
+def current_watch():
+    """The stopwatch the buttons act on."""
+    return registry.get(st.session_state.board, st.session_state.watch_name)
+
 def start_timer():
     """Start the stopwatch instantly."""
-    if not st.session_state.running:
-        st.session_state.start_time = time.time() - st.session_state.elapsed_time
-        st.session_state.running = True
-        if st.session_state.session_id is None:
-            st.session_state.session_id = datetime.now().strftime("%Y%m%d%H%M%S")
+    current_watch().start()
 
 def stop_timer():
     """Stop the stopwatch and save the session."""
-    if st.session_state.running:
-        st.session_state.elapsed_time = time.time() - st.session_state.start_time
-        st.session_state.running = False
-
-        # Save session to CSV
-        df = pd.read_csv(DATA_FILE)
-        new_session = pd.DataFrame({
-            "session_id": [st.session_state.session_id],
-            "start_time": [datetime.fromtimestamp(st.session_state.start_time).strftime("%Y-%m-%d %H:%M:%S")],
-            "end_time": [datetime.now().strftime("%Y-%m-%d %H:%M:%S")],
-            "duration_seconds": [st.session_state.elapsed_time]
-        })
-        df = pd.concat([df, new_session], ignore_index=True)
-        df.to_csv(DATA_FILE, index=False)
+    current_watch().stop()
 
 def reset_timer():
     """Reset everything instantly."""
-    st.session_state.start_time = None
-    st.session_state.elapsed_time = 0.0
-    st.session_state.running = False
-    st.session_state.laps = []
-    st.session_state.session_id = None
+    current_watch().reset()
 
 def add_lap():
     """Record a lap time."""
-    if st.session_state.running:
-        current_time = time.time() - st.session_state.start_time
-        lap_number = len(st.session_state.laps) + 1
-        st.session_state.laps.append({
-            "Lap": lap_number,
-            "Time": str(timedelta(seconds=int(current_time)))
-        })
+    current_watch().lap()
+
+def add_stopwatch():
+    """Create a named stopwatch on the board and switch to it."""
+    name = st.session_state.new_watch_name.strip()
+    if name:
+        registry.get(st.session_state.board, name)
+        st.session_state.watch_name = name
+    st.session_state.new_watch_name = ""
+
+# -------------------------------
+# Board Selection
+# -------------------------------
+with st.sidebar:
+    st.header("🗂 Timing Board")
+    st.text_input("Board name (share it to time as a team)", key="board")
+    st.query_params["board"] = st.session_state.board
+    st.text_input("New stopwatch", key="new_watch_name", on_change=add_stopwatch)
+    names = registry.names(st.session_state.board) or ["Main"]
+    if st.session_state.watch_name not in names and "Main" not in names:
+        # Back on a restored board: pick up its first stopwatch rather than a new "Main"
+        st.session_state.watch_name = names[0]
+    if st.session_state.watch_name not in names:
+        names.append(st.session_state.watch_name)
+    st.selectbox("Stopwatch", names, key="watch_name")
 
 # -------------------------------
 # Title
@@ -97,92 +132,134 @@ with col4:
     st.button("🏁 Lap", on_click=add_lap, use_container_width=True)
 
 # -------------------------------
-# Real-Time Display Placeholders
-# -------------------------------
-timer_placeholder = st.empty()
-gauge_placeholder = st.empty()
-
-# Create stable circular gauge only once
-def create_gauge(seconds_value=0):
-    """Create a stable circular gauge with fixed layout to prevent shaking."""
-    fig = go.Figure(go.Indicator(
-        mode="gauge+number",
-        value=seconds_value,
-        title={"text": "Seconds", "font": {"size": 20}},
-        gauge={
-            "axis": {"range": [0, 60]},
-            "bar": {"color": "#0077b6"},
-            "bgcolor": "#f1f1f1",
-            "steps": [
-                {"range": [0, 30], "color": "#90e0ef"},
-                {"range": [30, 60], "color": "#48cae4"}
-            ],
-            "borderwidth": 2,
-            "bordercolor": "gray",
-        },
-        number={"font": {"size": 36}}
-    ))
-    fig.update_layout(
-        height=300, width=300,
-        margin=dict(l=20, r=20, t=40, b=20),
-        paper_bgcolor="white"
+# Live Display
+# -------------------------------
+# The browser animates the display between button presses, so a running stopwatch costs the
+# server nothing: no sleep loop, no per-tick figure rebuilds. Each rerun (start/stop/lap)
+# only sends the elapsed time at render and whether the clock is running; the gauge
+# skeleton is serialized once per process and the needle moves by Plotly.restyle patches.
+# The display is a static component (day14_component/index.html) served by Streamlit,
+# with the Plotly bundle from the installed plotly package beside it, so no CDN is needed.
+@st.cache_resource
+def get_live_display():
+    """Declares the live display component once per process, after writing its Plotly bundle."""
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "day14_component")
+    write_plotly_bundle(path)
+    return components.declare_component("live_display", path=path)
+
+def current_elapsed():
+    """Elapsed seconds right now, whether running or stopped."""
+    return current_watch().timer.elapsed
+
+def render_live_display():
+    """Render the digital display and gauge; the browser keeps them ticking while running."""
+    get_live_display()(
+        **live_display_args(current_elapsed(), current_watch().timer.running),
+        key="live_display",
+        default=None
     )
-    return fig
 
-# Render the initial stable gauge
-fig = create_gauge()
-gauge_chart = gauge_placeholder.plotly_chart(fig, use_container_width=True)
+render_live_display()
 
 # -------------------------------
-# Live Timer Update Loop
+# Team Board
 # -------------------------------
-while st.session_state.running:
-    current_time = time.time() - st.session_state.start_time
+# All stopwatches on the board in one table, animated in the browser like the live display
+BOARD_HTML = """
+<table id="board" style="width:100%;font-family:monospace;font-size:1.1rem;border-collapse:collapse;"></table>
+<script>
+    const watches = __WATCHES__;
+    const loadedAt = performance.now();
 
-    # Update the gauge needle only
-    fig = create_gauge(current_time % 60)
-    gauge_chart.plotly_chart(fig, use_container_width=True)
+    function formatTime(seconds) {
+        const ms = Math.floor(seconds * 1000);
+        const s = Math.floor(ms / 1000);
+        return Math.floor(s / 3600) + ":" + String(Math.floor((s % 3600) / 60)).padStart(2, "0") + ":"
+            + String(s % 60).padStart(2, "0") + "." + String(ms % 1000).padStart(3, "0");
+    }
 
-    # Update digital display
-    timer_placeholder.markdown(
-        f"<h2 style='text-align:center;color:#023e8a;'>Elapsed Time: {str(timedelta(seconds=int(current_time)))}</h2>",
-        unsafe_allow_html=True
-    )
+    function render() {
+        const now = (performance.now() - loadedAt) / 1000;
+        document.getElementById("board").innerHTML = watches.map(w =>
+            "<tr><td>" + (w.running ? "▶ " : "⏸ ") + w.name + "</td><td style='text-align:right'>"
+            + formatTime(w.running ? w.elapsed + now : w.elapsed) + "</td><td style='text-align:right'>"
+            + w.laps + " laps</td></tr>"
+        ).join("");
+    }
 
-    # Small sleep to keep updates smooth
-    time.sleep(0.1)
+    render();
+    if (watches.some(w => w.running)) {
+        setInterval(render, 100);
+    }
+</script>
+"""
 
-# Show final frozen time when stopped
-final_time = st.session_state.elapsed_time if not st.session_state.running else time.time() - st.session_state.start_time
-timer_placeholder.markdown(
-    f"<h2 style='text-align:center;color:#023e8a;'>Elapsed Time: {str(timedelta(seconds=int(final_time)))}</h2>",
-    unsafe_allow_html=True
-)
+board_watches = registry.snapshot(st.session_state.board)
+if len(board_watches) > 1:
+    st.subheader(f"👥 Board: {st.session_state.board}")
+    # Stopwatch names are user input; escape them for the HTML table
+    for watch in board_watches:
+        watch["name"] = watch["name"].replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+    components.html(BOARD_HTML.replace("__WATCHES__", json.dumps(board_watches)), height=40 + 32 * len(board_watches))
 
 # -------------------------------
 # Lap Times Table
 # -------------------------------
-if st.session_state.laps:
+timer = current_watch().timer
+if len(timer):
     st.subheader("🏃 Lap Times")
-    lap_df = pd.DataFrame(st.session_state.laps)
-    st.table(lap_df)
+    lap1, lap2, lap3, lap4 = st.columns(4)
+    lap1.metric("Laps", len(timer))
+    lap2.metric("Best", format_ns(timer.best[1]), f"lap {timer.best[0] + 1}", delta_color="off")
+    lap3.metric("Worst", format_ns(timer.worst[1]), f"lap {timer.worst[0] + 1}", delta_color="off")
+    lap4.metric(f"Avg (last {timer.rolling_window})", format_ns(timer.rolling[-1]))
+
+    # Only the most recent laps are formatted, newest first, however long the session runs
+    lap_df = pd.DataFrame(timer.rows(len(timer) - LAP_TABLE_ROWS)[::-1])
+    st.dataframe(lap_df, hide_index=True, use_container_width=True)
 
 # -------------------------------
 # Session History and Stats
 # -------------------------------
 st.subheader("📊 Session History & Stats")
 
-history_df = pd.read_csv(DATA_FILE)
+# Stats render from the persisted running aggregates; only rows saved since the last rerun are read
+store.refresh()
+stats = store.summary()
+
+if stats.count:
+    stat1, stat2, stat3, stat4 = st.columns(4)
+    stat1.metric("Sessions", stats.count)
+    stat2.metric("Shortest", str(timedelta(seconds=int(stats.minimum))))
+    stat3.metric("Longest", str(timedelta(seconds=int(stats.maximum))))
+    stat4.metric("Std. Deviation", f"{stats.std:.1f}s")
 
-if not history_df.empty:
-    history_df = history_df.sort_values(by="start_time", ascending=False)
-    st.dataframe(history_df, use_container_width=True)
+    st.markdown(f"**Total Tracked Time:** {str(timedelta(seconds=int(stats.total)))}")
+    st.markdown(f"**Average Session Duration:** {str(timedelta(seconds=int(stats.mean)))}")
 
-    total_time = history_df["duration_seconds"].sum()
-    average_time = history_df["duration_seconds"].mean()
+    # Daily totals come straight from the per-day buckets
+    daily_df = pd.DataFrame(
+        [(day, total / 60) for day, (_, total) in sorted(stats.days.items())[-30:]],
+        columns=["Day", "Minutes"]
+    ).set_index("Day")
+    st.bar_chart(daily_df)
 
-    st.markdown(f"**Total Tracked Time:** {str(timedelta(seconds=int(total_time)))}")
-    st.markdown(f"**Average Session Duration:** {str(timedelta(seconds=int(average_time)))}")
+    # Raw rows are only read from disk when asked for, one page at a time from the end of the file
+    if st.checkbox("Show session history"):
+        view = st.radio("Range", ["Latest", "Last 7 days", "This month"], horizontal=True)
+        if view == "Latest":
+            page_count = (stats.count + HISTORY_PAGE_SIZE - 1) // HISTORY_PAGE_SIZE
+            page = st.number_input("Page (newest first)", min_value=1, max_value=page_count, value=1) - 1
+            history_df = pd.DataFrame(store.read_page(page, HISTORY_PAGE_SIZE), columns=COLUMNS)
+            history_df["duration_seconds"] = history_df["duration_seconds"].astype(float)
+        else:
+            # Only the day partitions in range are read from the archive; the query compacts new
+            # sessions into it once enough have piled up or a day has ended
+            archive = get_archive()
+            columns = archive.last_days(7) if view == "Last 7 days" else archive.this_month()
+            history_df = pd.DataFrame(columns).iloc[::-1]
+            st.caption(f"{len(history_df)} sessions, {history_df['duration_seconds'].sum() / 60:.1f} minutes in total")
+        st.dataframe(history_df, use_container_width=True)
 else:
     st.info("No sessions recorded yet.")
 
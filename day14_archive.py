@@ -0,0 +1,235 @@
+"""
+Columnar, date-partitioned archive of stopwatch_sessions.csv.
+
+Compaction rolls rows appended to the CSV since the last run into one part file per day:
+    stopwatch_archive/date=YYYY-MM-DD/part-<csv offset>.parquet   (pyarrow installed)
+    stopwatch_archive/date=YYYY-MM-DD/part-<csv offset>.npz       (NumPy fallback)
+A manifest records how far into the CSV has been compacted, so each run only reads new
+rows. Queries prune partitions by date and load only the columns asked for, then add the
+few rows appended since the last compaction, so results are always current. A query
+compacts first once that tail holds `compact_after` rows or rows from a day that has
+ended, so the tail it re-reads stays small.
+
+Compaction holds an exclusive lock on the CSV (the one CsvLog.append takes), so it never
+races an append or another compaction, and queries read under the shared lock.
+
+Usage: python day14_archive.py compact
+       python day14_archive.py query [--days 7 | --month] [--columns duration_seconds]
+"""
+import argparse
+import json
+import os
+from datetime import date, timedelta
+
+import numpy as np
+
+from csv_log import file_lock, read_rows
+from day14_store import COLUMNS
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # fall back to one compressed .npz of column arrays per part
+    pa = pq = None
+
+ARCHIVE_DIR = "stopwatch_archive"
+MANIFEST = "_manifest.json"
+COMPACT_AFTER = 10_000  # uncompacted rows that make the next query compact first
+
+
+def _day(row):
+    return row[1][:10]
+
+
+def _to_columns(rows):
+    """Turns CSV rows into column arrays (duration as float64, the rest as strings)."""
+    columns = {name: np.array([row[i] for row in rows], dtype=str) for i, name in enumerate(COLUMNS[:3])}
+    columns["duration_seconds"] = np.array([float(row[3]) for row in rows], dtype=np.float64)
+    return columns
+
+
+class SessionArchive:
+    """Compacts a session CSV into day partitions and answers date-range queries over them."""
+
+    def __init__(self, csv_path, root=ARCHIVE_DIR, compact_after=COMPACT_AFTER):
+        self.csv_path = csv_path
+        self.root = root
+        self.compact_after = compact_after
+        self.extension = ".parquet" if pq is not None else ".npz"
+        os.makedirs(root, exist_ok=True)
+
+    def _manifest_path(self):
+        return os.path.join(self.root, MANIFEST)
+
+    def compacted_offset(self):
+        """Bytes of the CSV already rolled into partitions."""
+        try:
+            with open(self._manifest_path()) as f:
+                return json.load(f)["offset"]
+        except (OSError, ValueError, KeyError):
+            return 0
+
+    def _read_tail(self, f, offset):
+        """Complete rows of the open CSV past `offset`, plus the offset they end at. Caller holds the lock."""
+        rows = []
+
+        def on_row(row):
+            if len(row) == len(COLUMNS):
+                try:
+                    float(row[3])
+                except ValueError:
+                    return
+                rows.append(row)
+
+        return rows, read_rows(f, offset, on_row)
+
+    def _open_csv(self):
+        """The CSV opened for reading, or None if no session has been saved yet (it is never created here)."""
+        try:
+            return open(self.csv_path, "rb")
+        except FileNotFoundError:
+            return None
+
+    def _write_part(self, path, columns):
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        if pq is not None:
+            pq.write_table(pa.table(columns), temp_path)
+        else:
+            with open(temp_path, "wb") as f:
+                np.savez_compressed(f, **columns)
+        os.replace(temp_path, path)
+
+    def compact(self):
+        """Rolls new CSV rows into per-day part files; returns the number of rows archived."""
+        f = self._open_csv()
+        if f is None:
+            return 0
+        with f, file_lock(f):
+            start = self.compacted_offset()
+            rows, end = self._read_tail(f, start)
+            if end == start:
+                return 0
+            by_day = {}
+            for row in rows:
+                by_day.setdefault(_day(row), []).append(row)
+            # Parts are named after the CSV offset they start at, so a run that dies before the
+            # manifest is updated is simply redone and overwrites its own files
+            for day, day_rows in by_day.items():
+                directory = os.path.join(self.root, f"date={day}")
+                os.makedirs(directory, exist_ok=True)
+                self._write_part(os.path.join(directory, f"part-{start:012d}{self.extension}"), _to_columns(day_rows))
+            # The manifest must never point past rows a crash could still drop from the CSV
+            os.fsync(f.fileno())
+            temp_path = f"{self._manifest_path()}.{os.getpid()}.tmp"
+            with open(temp_path, "w") as manifest:
+                json.dump({"offset": end, "format": self.extension[1:]}, manifest)
+            os.replace(temp_path, self._manifest_path())
+        return len(rows)
+
+    def partitions(self, start=None, end=None):
+        """Day partitions (as YYYY-MM-DD strings) within [start, end], oldest first."""
+        days = sorted(
+            name[5:] for name in os.listdir(self.root)
+            if name.startswith("date=") and os.path.isdir(os.path.join(self.root, name))
+        )
+        return [
+            day for day in days
+            if (start is None or day >= str(start)) and (end is None or day <= str(end))
+        ]
+
+    def _read_part(self, path, columns):
+        if path.endswith(".parquet"):
+            table = pq.read_table(path, columns=columns)
+            return {name: table.column(name).to_numpy() for name in columns}
+        # npz members are loaded lazily, so unrequested columns are never decompressed
+        with np.load(path, allow_pickle=False) as part:
+            return {name: part[name] for name in columns}
+
+    def query(self, start=None, end=None, columns=None):
+        """
+        Sessions whose start date lies in [start, end] (dates or YYYY-MM-DD strings; None is
+        open-ended), as a dict of column arrays in CSV order. Only matching partitions and
+        the requested columns are read from the archive.
+        """
+        columns = list(columns or COLUMNS)
+        result, tail = self._query(start, end, columns)
+        today = str(date.today())
+        if len(tail) >= self.compact_after or any(_day(row) < today for row in tail):
+            self.compact()
+            result, _ = self._query(start, end, columns)
+        return result
+
+    def _query(self, start, end, columns):
+        """The query result, plus the uncompacted rows it read from the CSV."""
+        f = self._open_csv()
+        if f is None:
+            tail = []
+            pieces = self._read_parts(start, end, columns)
+        else:
+            # Under the shared lock no compaction can move rows between the parts and the tail
+            with f, file_lock(f, exclusive=False):
+                pieces = self._read_parts(start, end, columns)
+                tail, _ = self._read_tail(f, self.compacted_offset())
+
+        in_range = [
+            row for row in tail
+            if (start is None or _day(row) >= str(start)) and (end is None or _day(row) <= str(end))
+        ]
+        if in_range:
+            recent = _to_columns(in_range)
+            pieces.append({name: recent[name] for name in columns})
+
+        if not pieces:
+            empty = {name: np.array([], dtype=np.float64 if name == "duration_seconds" else str) for name in columns}
+            return empty, tail
+        return {name: np.concatenate([piece[name] for piece in pieces]) for name in columns}, tail
+
+    def _read_parts(self, start, end, columns):
+        """The requested columns of every part file in the day partitions within [start, end]."""
+        pieces = []
+        for day in self.partitions(start, end):
+            directory = os.path.join(self.root, f"date={day}")
+            for name in sorted(os.listdir(directory)):
+                if name.startswith("part-") and name.endswith((".parquet", ".npz")):
+                    pieces.append(self._read_part(os.path.join(directory, name), columns))
+        return pieces
+
+    def last_days(self, days, columns=None):
+        """Sessions started in the last `days` days, today included."""
+        today = date.today()
+        return self.query(today - timedelta(days=days - 1), today, columns)
+
+    def this_month(self, columns=None):
+        today = date.today()
+        return self.query(today.replace(day=1), today, columns)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=["compact", "query"])
+    parser.add_argument("--csv", default="stopwatch_sessions.csv")
+    parser.add_argument("--root", default=ARCHIVE_DIR)
+    parser.add_argument("--days", type=int)
+    parser.add_argument("--month", action="store_true")
+    parser.add_argument("--columns", nargs="+", choices=COLUMNS)
+    args = parser.parse_args()
+
+    archive = SessionArchive(args.csv, args.root)
+    if args.command == "compact":
+        print(f"archived {archive.compact()} rows into {args.root} ({archive.extension[1:]})")
+        return
+    if args.days:
+        result = archive.last_days(args.days, args.columns)
+    elif args.month:
+        result = archive.this_month(args.columns)
+    else:
+        result = archive.query(columns=args.columns)
+    count = len(next(iter(result.values())))
+    print(f"{count} sessions")
+    if "duration_seconds" in result and count:
+        durations = result["duration_seconds"]
+        print(f"total {durations.sum():.1f}s  mean {durations.mean():.1f}s  max {durations.max():.1f}s")
+
+
+if __name__ == "__main__":
+    main()
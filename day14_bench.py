@@ -0,0 +1,55 @@
+"""
+Benchmark for the day14 stopwatch gauge update path.
+Compares the old path (build a new go.Figure and serialize all of it on every 100 ms
+tick) with what day14.py sends now: the live display component's arguments, once per
+rerun, with the cached skeleton and the elapsed time. Between reruns the browser ticks
+the gauge itself, so a running stopwatch sends nothing per tick. Reports the server CPU
+per update and the bytes sent, per update and per second at the given tick rate.
+
+Usage: python day14_bench.py [--ticks 2000] [--rate 10]
+"""
+import argparse
+import json
+import time
+
+from day14_gauge import create_gauge, gauge_skeleton_json, live_display_args
+
+
+def bench_full(ticks):
+    """Returns (CPU ms per tick, bytes per tick) for rebuilding the whole figure every tick."""
+    sent = 0
+    start = time.process_time()
+    for tick in range(ticks):
+        sent += len(create_gauge((tick / 10) % 60).to_json())
+    return (time.process_time() - start) / ticks * 1000, sent / ticks
+
+
+def bench_rerun(reruns):
+    """Returns (CPU ms per rerun, bytes per rerun) for the component arguments day14.py sends."""
+    gauge_skeleton_json.cache_clear()
+    sent = 0
+    start = time.process_time()
+    for rerun in range(reruns):
+        # Streamlit sends component arguments as JSON
+        sent += len(json.dumps(live_display_args(rerun / 10, True)))
+    return (time.process_time() - start) / reruns * 1000, sent / reruns
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ticks", type=int, default=2000)
+    parser.add_argument("--rate", type=float, default=10, help="gauge updates per second")
+    args = parser.parse_args()
+
+    full_ms, full_bytes = bench_full(args.ticks)
+    rerun_ms, rerun_bytes = bench_rerun(args.ticks)
+
+    print(f"ticks={args.ticks} rate={args.rate:g}/s")
+    print(f"{'path':>12} {'CPU ms/update':>14} {'bytes/update':>13} {'bytes/s running':>16}")
+    print(f"{'full figure':>12} {full_ms:>14.3f} {full_bytes:>13,.0f} {full_bytes * args.rate:>16,.0f}")
+    # The component is only re-sent when a button causes a rerun, never per tick
+    print(f"{'per rerun':>12} {rerun_ms:>14.3f} {rerun_bytes:>13,.0f} {0:>16,}")
+
+
+if __name__ == "__main__":
+    main()
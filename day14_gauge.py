@@ -0,0 +1,61 @@
+import os
+from functools import lru_cache
+
+import plotly.graph_objects as go
+from plotly.offline import get_plotlyjs
+
+
+# Create stable circular gauge only once
+def create_gauge(seconds_value=0):
+    """Create a stable circular gauge with fixed layout to prevent shaking."""
+    fig = go.Figure(go.Indicator(
+        mode="gauge+number",
+        value=seconds_value,
+        title={"text": "Seconds", "font": {"size": 20}},
+        gauge={
+            "axis": {"range": [0, 60]},
+            "bar": {"color": "#0077b6"},
+            "bgcolor": "#f1f1f1",
+            "steps": [
+                {"range": [0, 30], "color": "#90e0ef"},
+                {"range": [30, 60], "color": "#48cae4"}
+            ],
+            "borderwidth": 2,
+            "bordercolor": "gray",
+        },
+        number={"font": {"size": 36}}
+    ))
+    fig.update_layout(
+        height=300, width=300,
+        margin=dict(l=20, r=20, t=40, b=20),
+        paper_bgcolor="white"
+    )
+    return fig
+
+
+@lru_cache(maxsize=1)
+def gauge_skeleton_json():
+    """The full gauge figure, built and serialized once per process."""
+    return create_gauge().to_json()
+
+
+def live_display_args(elapsed, running):
+    """
+    The arguments day14.py passes to the live display component on each rerun. Between
+    reruns the browser moves the needle itself, so nothing else is sent per tick.
+    """
+    return {"figure": gauge_skeleton_json(), "elapsed": elapsed, "running": running}
+
+
+def write_plotly_bundle(directory):
+    """
+    Writes the plotly.js bundle shipped with the plotly package into `directory` as
+    plotly.min.js, so the browser loads it from the app instead of a CDN, and always in
+    the same version as the figure JSON. The file is replaced atomically.
+    """
+    path = os.path.join(directory, "plotly.min.js")
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        f.write(get_plotlyjs())
+    os.replace(temp_path, path)
+    return path
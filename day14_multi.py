@@ -0,0 +1,288 @@
+"""
+Multi-stopwatch server mode for day14: many named stopwatches per board (team or user)
+and many boards per process, all driven by one shared scheduler thread.
+
+Stopwatch keeps the start/stop/reset/lap semantics of the day14 buttons. Display updates
+are periodic callbacks on the Scheduler, a heap of due times served by a single thread,
+so hundreds of running timers cost one thread rather than one sleep loop each. The same
+thread sweeps idle boards out of memory.
+
+Usage: python day14_multi.py [--boards 10] [--timers 50] [--seconds 5] [--rate 10]
+"""
+import argparse
+import heapq
+import itertools
+import random
+import threading
+import time
+import traceback
+from datetime import datetime
+
+from day14_timer import LapTimer, format_ns
+
+
+class Stopwatch:
+    """
+    One named stopwatch. Stopping it hands the finished session to `on_stop`.
+    With a journal, every start, stop, lap and reset is checkpointed so the stopwatch can be
+    rebuilt after a restart; nothing is written while it merely runs.
+    """
+
+    def __init__(self, name, on_stop=None, journal=None, board=None):
+        self.name = name
+        self.on_stop = on_stop
+        self.journal = journal
+        self.board = board
+        self.timer = LapTimer()
+        self.session_id = None
+        self._mutex = threading.Lock()
+
+    def _checkpoint(self):
+        if self.journal is not None:
+            self.journal.save(self.board, self.name, self.session_id, self.timer.checkpoint())
+
+    def restore(self, session_id, state, splits):
+        with self._mutex:
+            self.session_id = session_id
+            self.timer.restore(state, splits)
+
+    def start(self):
+        with self._mutex:
+            if not self.timer.running:
+                self.timer.start()
+                if self.session_id is None:
+                    self.session_id = datetime.now().strftime("%Y%m%d%H%M%S")
+                self._checkpoint()
+
+    def stop(self):
+        with self._mutex:
+            if not self.timer.running:
+                return
+            self.timer.stop()
+            self._checkpoint()
+            session = (
+                self.session_id,
+                datetime.fromtimestamp(self.timer.started_at).strftime("%Y-%m-%d %H:%M:%S"),
+                datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                self.timer.elapsed
+            )
+        if self.on_stop is not None:
+            self.on_stop(*session)
+
+    def reset(self):
+        with self._mutex:
+            self.timer.reset()
+            self.session_id = None
+            if self.journal is not None:
+                self.journal.remove(self.board, self.name)
+
+    def lap(self):
+        with self._mutex:
+            duration = self.timer.lap()
+            if duration is not None and self.journal is not None:
+                self.journal.add_lap(self.board, self.name, len(self.timer) - 1, self.timer.splits[-1])
+            return duration
+
+    def snapshot(self):
+        """A consistent view for display: name, elapsed seconds, running flag and lap count."""
+        with self._mutex:
+            return {
+                "name": self.name,
+                "elapsed": self.timer.elapsed,
+                "running": self.timer.running,
+                "laps": len(self.timer),
+            }
+
+
+class Scheduler:
+    """
+    Runs periodic callbacks from a single background thread.
+    Subscriptions sit in a min-heap keyed by their next due time; the thread sleeps until
+    the earliest one is due, so the cost is O(log n) per callback and one thread in total.
+    A callback that raises is dropped.
+    """
+
+    def __init__(self):
+        self._heap = []     # (due, handle, interval, callback)
+        self._cancelled = set()
+        self._handles = itertools.count()
+        self._wakeup = threading.Condition()
+        self._thread = None
+
+    def every(self, interval, callback):
+        """Calls callback() every `interval` seconds; returns a handle for cancel()."""
+        handle = next(self._handles)
+        with self._wakeup:
+            heapq.heappush(self._heap, (time.monotonic() + interval, handle, interval, callback))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="stopwatch-scheduler", daemon=True)
+                self._thread.start()
+            self._wakeup.notify()
+        return handle
+
+    def cancel(self, handle):
+        with self._wakeup:
+            self._cancelled.add(handle)
+
+    def _run(self):
+        while True:
+            with self._wakeup:
+                if not self._heap:
+                    self._wakeup.wait()
+                    continue
+                due, handle, interval, callback = self._heap[0]
+                now = time.monotonic()
+                if due > now:
+                    self._wakeup.wait(due - now)
+                    continue
+                heapq.heappop(self._heap)
+                if handle in self._cancelled:
+                    self._cancelled.discard(handle)
+                    continue
+                # A late callback skips the ticks it missed instead of firing in a burst
+                next_due = due + interval
+                if next_due <= now:
+                    next_due = now + interval
+                heapq.heappush(self._heap, (next_due, handle, interval, callback))
+            try:
+                callback()
+            except Exception:
+                traceback.print_exc()
+                self.cancel(handle)
+
+
+class StopwatchRegistry:
+    """
+    All stopwatches in the process, grouped by board, sharing one Scheduler.
+    Boards are held in memory only while in use: the scheduler sweeps out boards with no
+    running stopwatch that nobody has looked at for `idle_ttl` seconds. With a journal, a
+    board is loaded from it on first use, so stopwatches left over from a previous process
+    or from an evicted board come back as they were.
+    """
+
+    def __init__(self, on_stop=None, scheduler=None, journal=None, idle_ttl=3600, sweep_interval=60):
+        self.on_stop = on_stop
+        self.scheduler = scheduler or Scheduler()
+        self.journal = journal
+        self.idle_ttl = idle_ttl
+        self._boards = {}       # board -> {name: Stopwatch}
+        self._last_used = {}    # board -> time.monotonic() of its last use
+        self._mutex = threading.Lock()
+        self.scheduler.every(sweep_interval, self.evict_idle)
+
+    def _board(self, board):
+        """The board's stopwatches, loading them from the journal on first use. Caller holds the mutex."""
+        self._last_used[board] = time.monotonic()
+        watches = self._boards.get(board)
+        if watches is None:
+            watches = self._boards[board] = {}
+            if self.journal is not None:
+                for _, name, session_id, state, splits in self.journal.load(board):
+                    watches[name] = Stopwatch(name, self.on_stop, self.journal, board)
+                    watches[name].restore(session_id, state, splits)
+        return watches
+
+    def get(self, board, name):
+        """Returns the named stopwatch on a board, creating it if needed."""
+        with self._mutex:
+            watches = self._board(board)
+            if name not in watches:
+                watches[name] = Stopwatch(name, self.on_stop, self.journal, board)
+            return watches[name]
+
+    def remove(self, board, name):
+        with self._mutex:
+            watch = self._board(board).pop(name, None)
+        if watch is not None:
+            watch.stop()
+            if self.journal is not None:
+                self.journal.remove(board, name)
+
+    def names(self, board):
+        with self._mutex:
+            return list(self._board(board))
+
+    def snapshot(self, board):
+        with self._mutex:
+            watches = list(self._board(board).values())
+        return [watch.snapshot() for watch in watches]
+
+    def evict_idle(self):
+        """Drops boards idle for longer than `idle_ttl` with no stopwatch running; returns how many."""
+        cutoff = time.monotonic() - self.idle_ttl
+        with self._mutex:
+            idle = [
+                board for board, used in self._last_used.items()
+                if used < cutoff and not any(watch.timer.running for watch in self._boards[board].values())
+            ]
+            for board in idle:
+                del self._boards[board]
+                del self._last_used[board]
+        return len(idle)
+
+    def watch(self, board, callback, interval=0.1):
+        """Calls callback(snapshot) for a board every `interval` seconds; returns a cancel handle."""
+        return self.scheduler.every(interval, lambda: callback(self.snapshot(board)))
+
+    def unwatch(self, handle):
+        self.scheduler.cancel(handle)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--boards", type=int, default=10)
+    parser.add_argument("--timers", type=int, default=50, help="stopwatches per board")
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--rate", type=float, default=10, help="display updates per second per board")
+    args = parser.parse_args()
+
+    saved = []
+    registry = StopwatchRegistry(on_stop=lambda *session: saved.append(session))
+    lags = []
+    frame_bytes = []
+    interval = 1 / args.rate
+
+    def display(board):
+        expected = [time.monotonic() + interval]
+
+        def render(snapshot):
+            now = time.monotonic()
+            lags.append(now - expected[0])
+            expected[0] = now + interval
+            # Stand-in for pushing a frame to the board's viewers
+            frame = "\n".join(
+                f"{w['name']}: {format_ns(int(w['elapsed'] * 1e9))} ({w['laps']} laps)" for w in snapshot
+            )
+            frame_bytes.append(len(frame))
+
+        registry.watch(board, render, interval)
+
+    for board in range(args.boards):
+        for timer in range(args.timers):
+            registry.get(f"board-{board}", f"timer-{timer}").start()
+        display(f"board-{board}")
+
+    cpu_start = time.process_time()
+    end = time.monotonic() + args.seconds
+    laps = 0
+    while time.monotonic() < end:
+        board, timer = random.randrange(args.boards), random.randrange(args.timers)
+        registry.get(f"board-{board}", f"timer-{timer}").lap()
+        laps += 1
+        time.sleep(0.001)
+    cpu = time.process_time() - cpu_start
+
+    for board in range(args.boards):
+        for name in registry.names(f"board-{board}"):
+            registry.get(f"board-{board}", name).stop()
+
+    lags.sort()
+    print(f"boards={args.boards} timers={args.boards * args.timers} rate={args.rate:g}/s "
+          f"threads={threading.active_count()}")
+    print(f"frames: {len(frame_bytes)}  laps: {laps}  sessions saved: {len(saved)}  CPU: {cpu / args.seconds:.1%}")
+    if lags:
+        print(f"tick lag ms: median {lags[len(lags) // 2] * 1000:.2f}  p99 {lags[int(len(lags) * 0.99)] * 1000:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+import json
+import math
+import os
+import threading
+
+from csv_log import CsvLog
+
+COLUMNS = ["session_id", "start_time", "end_time", "duration_seconds"]
+
+
+class SessionStats:
+    """Running aggregates over session durations: count, sum, sum of squares, min, max and per-day buckets."""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.total_squares = 0.0
+        self.minimum = None
+        self.maximum = None
+        self.days = {}  # "YYYY-MM-DD" -> [count, total seconds]
+
+    def add(self, day, duration):
+        self.count += 1
+        self.total += duration
+        self.total_squares += duration * duration
+        self.minimum = duration if self.minimum is None else min(self.minimum, duration)
+        self.maximum = duration if self.maximum is None else max(self.maximum, duration)
+        bucket = self.days.setdefault(day, [0, 0.0])
+        bucket[0] += 1
+        bucket[1] += duration
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    @property
+    def std(self):
+        if self.count < 2:
+            return 0.0
+        variance = (self.total_squares - self.total * self.total / self.count) / (self.count - 1)
+        return math.sqrt(max(variance, 0.0))
+
+    def to_dict(self):
+        return {
+            "count": self.count, "total": self.total, "total_squares": self.total_squares,
+            "minimum": self.minimum, "maximum": self.maximum, "days": self.days
+        }
+
+    def copy(self):
+        stats = SessionStats.from_dict(self.to_dict())
+        stats.days = {day: list(bucket) for day, bucket in self.days.items()}
+        return stats
+
+    @classmethod
+    def from_dict(cls, data):
+        stats = cls()
+        stats.count = data["count"]
+        stats.total = data["total"]
+        stats.total_squares = data["total_squares"]
+        stats.minimum = data["minimum"]
+        stats.maximum = data["maximum"]
+        stats.days = data["days"]
+        return stats
+
+
+class SessionStore:
+    """
+    Append-only store for stopwatch sessions in stopwatch_sessions.csv.
+    Saving a session appends one locked row (fsynced every `fsync_every` rows) instead of
+    reading and rewriting the whole file. Aggregates are kept in a JSON sidecar together with
+    the CSV offset they cover, so a restart resumes from there instead of rescanning history.
+    The sidecar is only rewritten when the CSV has just been fsynced (at a batch boundary or
+    on sync()), so it never covers rows that a crash could still drop.
+    """
+
+    def __init__(self, path, fsync_every=10):
+        self.path = path
+        self.stats_path = os.path.splitext(path)[0] + ".stats.json"
+        self._mutex = threading.Lock()
+        self.stats, offset = self._load_stats()
+        self._saved_offset = offset
+        self._log = CsvLog(path, COLUMNS, self._on_row, fsync_every=fsync_every, offset=offset)
+        self._save_stats()
+
+    def _load_stats(self):
+        """Loads the sidecar if it still matches the CSV, otherwise starts from scratch."""
+        try:
+            with open(self.stats_path) as f:
+                data = json.load(f)
+            if data["offset"] <= os.path.getsize(self.path):
+                return SessionStats.from_dict(data["stats"]), data["offset"]
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+        return SessionStats(), 0
+
+    def _save_stats(self):
+        """Atomically rewrites the sidecar if new rows have been folded in since the last save."""
+        def read_state(offset):
+            with self._mutex:
+                if offset == self._saved_offset:
+                    return None
+                self._saved_offset = offset
+                return json.dumps({"offset": offset, "stats": self.stats.to_dict()})
+
+        data = self._log.checkpoint(read_state)
+        if data is None:
+            return
+        temp_path = f"{self.stats_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, "w") as f:
+            f.write(data)
+        os.replace(temp_path, self.stats_path)
+
+    def _on_row(self, row):
+        try:
+            day, duration = row[1][:10], float(row[3])
+        except (IndexError, ValueError):
+            return
+        with self._mutex:
+            self.stats.add(day, duration)
+
+    def add_session(self, session_id, start_time, end_time, duration_seconds):
+        """Appends one finished session and updates the aggregates."""
+        self._log.append([session_id, start_time, end_time, duration_seconds])
+        if not self._log.unsynced:
+            self._save_stats()
+
+    def refresh(self):
+        """Folds in sessions saved by other sessions or processes since the last read."""
+        self._log.refresh()
+
+    def sync(self):
+        """Forces any sessions since the last fsync batch boundary to disk and saves the aggregates."""
+        self._save_stats()
+
+    def summary(self):
+        """Returns a consistent copy of the aggregates without touching the CSV."""
+        with self._mutex:
+            return self.stats.copy()
+
+    def read_page(self, page=0, page_size=50):
+        """Returns one page of raw session rows, most recently saved first."""
+        return self._log.read_last_rows(skip=page * page_size, limit=page_size)
@@ -0,0 +1,142 @@
+import time
+from array import array
+
+NS_PER_SECOND = 1_000_000_000
+ROLLING_WINDOW = 5
+CLOCK_ORIGIN_TOLERANCE = 2.0  # seconds of wall-clock drift before a restored run counts as a new boot
+
+
+def format_ns(ns, signed=False):
+    """Formats nanoseconds as H:MM:SS.mmm (with a leading sign for deltas)."""
+    sign = "-" if ns < 0 else ("+" if signed else "")
+    ms = abs(ns) // 1_000_000
+    seconds, ms = divmod(ms, 1000)
+    minutes, seconds = divmod(seconds, 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{sign}{hours}:{minutes:02d}:{seconds:02d}.{ms:03d}"
+
+
+class LapTimer:
+    """
+    Stopwatch timed on a monotonic nanosecond clock, so wall-clock changes never skew it.
+    Laps are kept in compact int64 arrays (split, lap time, delta to the previous lap and
+    rolling average), and best/worst/rolling figures are updated in O(1) per lap, so
+    sessions with thousands of laps stay cheap to record and render.
+    """
+
+    def __init__(self, rolling_window=ROLLING_WINDOW, clock=time.monotonic_ns):
+        self.rolling_window = rolling_window
+        self.clock = clock
+        self.reset()
+
+    def reset(self):
+        self.running = False
+        self.started_at = None      # wall-clock time of the first start, for display and saving
+        self._accumulated = 0       # ns counted before the current run
+        self._run_start = 0         # clock reading when the current run began
+        self._run_start_wall = 0.0  # wall-clock time of the same instant, for recovery after a reboot
+        self.splits = array("q")    # elapsed ns at each lap
+        self.laps = array("q")      # duration of each lap
+        self.deltas = array("q")    # lap minus the previous lap (0 for the first)
+        self.rolling = array("q")   # mean of the last `rolling_window` laps, as of each lap
+        self.best = None            # (lap index, ns)
+        self.worst = None
+        self._window_total = 0
+
+    def start(self):
+        if not self.running:
+            if self.started_at is None:
+                self.started_at = time.time()
+            self._run_start = self.clock()
+            self._run_start_wall = time.time()
+            self.running = True
+
+    def stop(self):
+        if self.running:
+            self._accumulated += self.clock() - self._run_start
+            self.running = False
+
+    @property
+    def elapsed_ns(self):
+        if self.running:
+            return self._accumulated + self.clock() - self._run_start
+        return self._accumulated
+
+    @property
+    def elapsed(self):
+        """Elapsed time in seconds."""
+        return self.elapsed_ns / NS_PER_SECOND
+
+    def lap(self):
+        """Records a lap at the current elapsed time; ignored while stopped. Returns the lap ns."""
+        if not self.running:
+            return None
+        return self._add_split(self.elapsed_ns)
+
+    def _add_split(self, split):
+        duration = split - (self.splits[-1] if self.splits else 0)
+        index = len(self.laps)
+        self.deltas.append(duration - self.laps[-1] if self.laps else 0)
+        self.splits.append(split)
+        self.laps.append(duration)
+
+        self._window_total += duration
+        if index >= self.rolling_window:
+            self._window_total -= self.laps[index - self.rolling_window]
+        self.rolling.append(self._window_total // min(index + 1, self.rolling_window))
+
+        if self.best is None or duration < self.best[1]:
+            self.best = (index, duration)
+        if self.worst is None or duration > self.worst[1]:
+            self.worst = (index, duration)
+        return duration
+
+    def checkpoint(self):
+        """The state needed to rebuild this timer in another process (laps aside)."""
+        return {
+            "started_at": self.started_at,
+            "accumulated_ns": self._accumulated,
+            "run_start_ns": self._run_start,
+            "run_start_wall": self._run_start_wall,
+            "running": self.running,
+        }
+
+    def restore(self, state, splits=()):
+        """
+        Rebuilds the timer from checkpoint() and its lap splits. A run still in progress keeps
+        counting from the monotonic reading it started at, as long as the clock is the same one:
+        if the wall-clock instant the clock counts from has moved (the machine rebooted), the
+        wall-clock time since the run began is used instead.
+        """
+        self.reset()
+        self.started_at = state["started_at"]
+        self._accumulated = state["accumulated_ns"]
+        if state["running"]:
+            now, wall_now = self.clock(), time.time()
+            origin_then = state["run_start_wall"] - state["run_start_ns"] / NS_PER_SECOND
+            origin_now = wall_now - now / NS_PER_SECOND
+            if abs(origin_now - origin_then) < CLOCK_ORIGIN_TOLERANCE:
+                self._run_start = state["run_start_ns"]
+            else:
+                self._run_start = now - int((wall_now - state["run_start_wall"]) * NS_PER_SECOND)
+            self._run_start_wall = state["run_start_wall"]
+            self.running = True
+        for split in splits:
+            self._add_split(split)
+
+    def __len__(self):
+        return len(self.laps)
+
+    def rows(self, start=0, stop=None):
+        """Formatted lap rows for display, optionally only a slice of them."""
+        stop = len(self.laps) if stop is None else min(stop, len(self.laps))
+        return [
+            {
+                "Lap": i + 1,
+                "Lap Time": format_ns(self.laps[i]),
+                "Split": format_ns(self.splits[i]),
+                "Delta": format_ns(self.deltas[i], signed=True) if i else "",
+                f"Avg (last {self.rolling_window})": format_ns(self.rolling[i]),
+            }
+            for i in range(max(start, 0), stop)
+        ]
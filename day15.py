@@ -1,14 +1,23 @@
 import streamlit as st
-import random
+import streamlit.components.v1 as components
+import os
 import time
+from day15_engine import WALL_LAYOUTS, MAX_FOOD, make_walls, new_seed, verify_game
+from day15_leaderboard import Leaderboard
+from day15_render import BoardRenderer
+from day15_replay import Replay, ReplayPlayer, list_replays, load_replay, save_replay
 
 # --- Game Configuration ---
 # Set page configuration for a wider layout
 st.set_page_config(layout="wide")
 
-# Define grid size and cell size for rendering
-GRID_SIZE = 20
-CELL_SIZE = 20
+# Selectable grid sizes; cells shrink so the board keeps roughly the same pixel size
+GRID_SIZES = [10, 20, 40, 100, 200]
+BOARD_PIXELS = 400
+
+def cell_size_for(grid_size):
+    """Returns the cell size in pixels for a grid size."""
+    return max(2, BOARD_PIXELS // grid_size)
 
 # Define colors for the game elements using a CSS-like style
 COLORS = {
@@ -19,127 +28,70 @@ COLORS = {
     "wall": "#34495e"         # Darker blue-gray
 }
 
-# --- Session State Initialization ---
-# This ensures the game state persists across reruns
-if 'game_over' not in st.session_state:
-    st.session_state.game_over = True
-    # Initialize all game-related state variables here to prevent errors on the first run
-    st.session_state.score = 0
-    st.session_state.snake = [(GRID_SIZE // 2, GRID_SIZE // 2)]
-    st.session_state.direction = "Right"
-    st.session_state.food = (random.randint(0, GRID_SIZE - 1), random.randint(0, GRID_SIZE - 1))
-    st.session_state.speed = 0.2
-
-def initialize_game():
-    """Initializes or resets the game state."""
-    st.session_state.game_over = False
-    st.session_state.score = 0
-    # The snake starts in the center of the grid
-    st.session_state.snake = [(GRID_SIZE // 2, GRID_SIZE // 2)]
-    st.session_state.direction = "Right"
-    # Generate the first food item
-    generate_food()
-    st.session_state.speed = 0.2  # Initial speed
-
-def generate_food():
-    """Generates a new random position for the food."""
-    while True:
-        food_pos = (random.randint(0, GRID_SIZE - 1), random.randint(0, GRID_SIZE - 1))
-        # Ensure food does not appear on the snake's body
-        if food_pos not in st.session_state.snake:
-            st.session_state.food = food_pos
-            break
-
-def check_collision():
-    """Checks for collisions with walls or the snake's own body."""
-    head_x, head_y = st.session_state.snake[0]
-    
-    # Check for wall collision
-    if head_x < 0 or head_x >= GRID_SIZE or head_y < 0 or head_y >= GRID_SIZE:
-        st.session_state.game_over = True
-        return True
-    
-    # Check for self-collision
-    if st.session_state.snake[0] in st.session_state.snake[1:]:
-        st.session_state.game_over = True
-        return True
-        
-    return False
-
-def update_game():
-    """Updates the game state for the next frame."""
-    head_x, head_y = st.session_state.snake[0]
-    direction = st.session_state.direction
-    
-    new_head = (head_x, head_y)
-    if direction == "Up":
-        new_head = (head_x, head_y - 1)
-    elif direction == "Down":
-        new_head = (head_x, head_y + 1)
-    elif direction == "Left":
-        new_head = (head_x - 1, head_y)
-    elif direction == "Right":
-        new_head = (head_x + 1, head_y)
-        
-    # Add the new head to the snake
-    st.session_state.snake.insert(0, new_head)
-    
-    # Check if the snake ate the food
-    if st.session_state.snake[0] == st.session_state.food:
-        st.session_state.score += 1
-        # Increase speed slightly for more challenge
-        if st.session_state.speed > 0.05:
-            st.session_state.speed -= 0.005
-        generate_food()
-    else:
-        # Remove the tail to simulate movement
-        st.session_state.snake.pop()
-        
-    # Check for collision after moving the snake
-    check_collision()
+LEADERBOARD_FILE = "snake_leaderboard.csv"
+LEADERBOARD_SIZE = 10
 
-def draw_board():
-    """
-    Renders the game board using a combination of Streamlit markdown and CSS.
-    Each cell is represented by a small colored box.
+# The game loop runs in the browser (day15_component/index.html) so no server thread is held
+# per player; the server only replays the final move log to verify the score.
+snake_board = components.declare_component(
+    "snake_board",
+    path=os.path.join(os.path.dirname(os.path.abspath(__file__)), "day15_component")
+)
+
+# --- Session State Initialization ---
+# The seed is issued by the server so a player cannot pick a favourable food sequence
+# and its issue time bounds how long a submitted game can claim to have lasted
+if 'seed' not in st.session_state:
+    st.session_state.seed = new_seed()
+    st.session_state.seed_issued = time.monotonic()
+if 'last_game' not in st.session_state:
+    st.session_state.last_game = None
+if 'rejected' not in st.session_state:
+    st.session_state.rejected = False
+if 'replay_player' not in st.session_state:
+    st.session_state.replay_player = None
+    st.session_state.replay_path = None
+
+@st.cache_resource
+def get_renderer(grid_size, layout):
+    """Builds (once per board setting) the renderer used for the final verified board."""
+    return BoardRenderer(grid_size, cell_size_for(grid_size), COLORS, make_walls(layout, grid_size))
+
+@st.cache_data
+def wall_cells(grid_size, layout):
+    """Returns the obstacle cells as row-major indices for the browser component."""
+    return sorted(y * grid_size + x for x, y in make_walls(layout, grid_size))
+
+@st.cache_resource
+def get_leaderboard():
+    """One shared leaderboard per server process; the CSV is scanned only once, at startup."""
+    return Leaderboard(LEADERBOARD_FILE, k=LEADERBOARD_SIZE)
+
+def save_score(name, score):
+    """Appends a verified final score to the leaderboard."""
+    get_leaderboard().add(name, score)
+
+def submit_game(result, name):
+    """Replays a finished browser game and records it if the claimed score holds up."""
+    elapsed = time.monotonic() - st.session_state.seed_issued
+    game = verify_game(result, st.session_state.seed, elapsed)
+    # Issue a fresh seed either way so the same log cannot be submitted twice
+    st.session_state.seed = new_seed()
+    st.session_state.seed_issued = time.monotonic()
+    st.session_state.rejected = game is None
+    if game is not None:
+        st.session_state.last_game = game
+        save_score(name, game.score)
+        # Keep the game as a compact replay (seed + direction changes) for playback and audits
+        save_replay(Replay.from_game(game))
+
+def draw_board(game):
     """
-    board_html = f"""
-    <div style="
-        display: grid; 
-        grid-template-columns: repeat({GRID_SIZE}, {CELL_SIZE}px);
-        grid-template-rows: repeat({GRID_SIZE}, {CELL_SIZE}px);
-        width: {GRID_SIZE * CELL_SIZE}px;
-        height: {GRID_SIZE * CELL_SIZE}px;
-        background-color: {COLORS['background']};
-        border-radius: 10px;
-        overflow: hidden;
-    ">
+    Renders the game board using Streamlit markdown and CSS.
+    Only wall, snake and food cells are sent; empty cells are just the board background.
     """
-    
-    # Draw each cell of the grid
-    for y in range(GRID_SIZE):
-        for x in range(GRID_SIZE):
-            color = ""
-            if (x, y) == st.session_state.food:
-                color = COLORS['food']
-            elif (x, y) == st.session_state.snake[0]:
-                color = COLORS['snake_head']
-            elif (x, y) in st.session_state.snake:
-                color = COLORS['snake_body']
-
-            if color:
-                board_html += f"""
-                <div style="
-                    background-color: {color};
-                    border-radius: 3px;
-                    margin: 1px;
-                "></div>
-                """
-            else:
-                board_html += f"<div></div>"
-                
-    board_html += "</div>"
-    st.markdown(board_html, unsafe_allow_html=True)
+    renderer = get_renderer(game.grid_size, game.layout)
+    st.markdown(renderer.frame(game), unsafe_allow_html=True)
 
 # --- Streamlit UI ---
 st.title("🐍 Classic Snake Game")
@@ -149,75 +101,77 @@ col1, col2 = st.columns([1, 1])
 # Sidebar for controls and score
 with col1:
     st.subheader("Controls")
-    
-    # Using columns for a cleaner button layout
-    button_col1, button_col2, button_col3 = st.columns([1, 1, 1])
-
-    with button_col2:
-        if st.button("Up", use_container_width=True):
-            if st.session_state.direction != "Down":
-                st.session_state.direction = "Up"
-    
-    button_col1, button_col2, button_col3 = st.columns([1, 1, 1])
-    with button_col1:
-        if st.button("Left", use_container_width=True):
-            if st.session_state.direction != "Right":
-                st.session_state.direction = "Left"
-    with button_col3:
-        if st.button("Right", use_container_width=True):
-            if st.session_state.direction != "Left":
-                st.session_state.direction = "Right"
-
-    button_col1, button_col2, button_col3 = st.columns([1, 1, 1])
-    with button_col2:
-        if st.button("Down", use_container_width=True):
-            if st.session_state.direction != "Up":
-                st.session_state.direction = "Down"
+    st.markdown("Click the board, then steer with the **arrow keys** or **W A S D**.")
+    player_name = st.text_input("Player name", value="Player")
+
+    st.subheader("Board")
+    # New settings apply from the next game; a game in progress keeps its own board
+    grid_size = st.selectbox("Grid size", GRID_SIZES, index=1, format_func=lambda n: f"{n} × {n}")
+    layout = st.selectbox("Walls", WALL_LAYOUTS, format_func=str.title)
+    food_count = st.slider("Food items", 1, MAX_FOOD, 1)
 
     st.markdown("---")
-    st.subheader(f"Score: {st.session_state.score}")
-    
-    if st.button("Start New Game"):
-        initialize_game()
-        
-    st.markdown("---")
-    if st.session_state.game_over:
+    last_game = st.session_state.last_game
+    if st.session_state.rejected:
+        st.error("The last game could not be verified and was not recorded.")
+    elif last_game is not None:
+        st.subheader(f"Final Score: {last_game.score}")
         st.error("Game Over!")
+        # Show where the verified replay ended
+        draw_board(last_game)
+
+    st.markdown("---")
+    st.subheader("🏆 Leaderboard")
+    leaderboard = get_leaderboard()
+    # Only rows appended since the last render are read from disk
+    leaderboard.refresh()
+    top_scores = leaderboard.top()
+    if top_scores:
+        st.table([{"Name": name, "Score": score} for name, score in top_scores])
+    else:
+        st.info("No scores recorded yet.")
 
 # Main game board display
 with col2:
-    game_board_placeholder = st.empty()
-
-# --- Game Loop ---
-# This loop runs continuously to update the game
-if not st.session_state.game_over:
-    with game_board_placeholder:
-        draw_board()
-    
-    update_game()
-    time.sleep(st.session_state.speed)
+    result = snake_board(
+        seed=st.session_state.seed,
+        grid_size=grid_size,
+        cell_size=cell_size_for(grid_size),
+        layout=layout,
+        walls=wall_cells(grid_size, layout),
+        food_count=food_count,
+        colors=COLORS,
+        key="snake_board",
+        default=None
+    )
+
+# --- Replay Playback ---
+st.markdown("---")
+with st.expander("🎬 Replays"):
+    replay_files = list_replays()
+    if replay_files:
+        replay_path = st.selectbox("Recorded game", replay_files, format_func=os.path.basename)
+        if st.session_state.replay_path != replay_path:
+            try:
+                st.session_state.replay_player = ReplayPlayer(load_replay(replay_path))
+            except (OSError, ValueError):
+                # A damaged file is skipped rather than breaking the page on every rerun
+                st.session_state.replay_player = None
+            st.session_state.replay_path = replay_path
+        player = st.session_state.replay_player
+
+        if player is None:
+            st.error(f"The replay {os.path.basename(replay_path)} is damaged and cannot be played.")
+        else:
+            # Seeking restores the nearest snapshot, so jumping anywhere in a long game stays cheap
+            tick = st.slider("Tick", 0, player.replay.ticks, player.replay.ticks)
+            replay_game = player.seek(tick)
+            st.markdown(f"**Score at tick {tick}:** {replay_game.score}")
+            draw_board(replay_game)
+    else:
+        st.info("Finish a game to record a replay.")
+
+# The component keeps returning its last value, so only a log for the current seed is new
+if result is not None and result.get("seed") == st.session_state.seed:
+    submit_game(result, player_name)
     st.rerun()
-    
-# Initial display when the game is over
-if st.session_state.game_over:
-    with game_board_placeholder:
-        st.markdown(
-            f"""
-            <div style="
-                display: flex;
-                flex-direction: column;
-                justify-content: center;
-                align-items: center;
-                width: {GRID_SIZE * CELL_SIZE}px;
-                height: {GRID_SIZE * CELL_SIZE}px;
-                background-color: {COLORS['background']};
-                border-radius: 10px;
-                color: white;
-                font-size: 2em;
-                text-align: center;
-            ">
-            <h1>Game Over!</h1>
-            <h2>Final Score: {st.session_state.score}</h2>
-            </div>
-            """, unsafe_allow_html=True
-        )
@@ -0,0 +1,226 @@
+"""
+Vectorized batch Snake simulator for large-scale bot evaluation and load modelling.
+Keeps K boards in stacked NumPy arrays and advances all of them with a handful of array
+operations per tick, instead of looping over K SnakeGame objects in Python.
+
+The rules match day15_engine.SnakeGame (walls, self-collision, tail moving out of the way,
+multi-food, board-full win), but food is drawn from NumPy's RNG, so batch games are
+statistically equivalent to single-engine games rather than replay-compatible with them.
+
+Usage: python day15_batch.py [--boards 4096] [--ticks 1000] [--grid-size 20]
+"""
+import argparse
+import time
+
+import numpy as np
+
+from day15_engine import DIRECTIONS, WALL_LAYOUTS, MAX_FOOD, make_walls
+
+# Direction codes follow the order of DIRECTIONS: Up, Down, Left, Right
+DX = np.array([dx for dx, _ in DIRECTIONS.values()], dtype=np.int32)
+DY = np.array([dy for _, dy in DIRECTIONS.values()], dtype=np.int32)
+OPPOSITE_CODE = np.array([1, 0, 3, 2], dtype=np.int8)
+RIGHT = list(DIRECTIONS).index("Right")
+NO_TURN = -1
+
+
+class BatchSnake:
+    """
+    K independent Snake boards stored as arrays:
+      body     (K, cells) ring buffer of cell indices, head at body[k, head_ptr[k]]
+      occupied (K, cells) snake occupancy grid
+      food     (K, food_count) food cell indices
+    plus per-board direction, length, score, ticks and alive flags.
+    """
+
+    def __init__(self, boards, grid_size=20, layout="none", food_count=1, seed=None):
+        if not 1 <= food_count <= MAX_FOOD:
+            raise ValueError(f"Food count must be between 1 and {MAX_FOOD}")
+        self.boards = boards
+        self.grid_size = grid_size
+        self.cells = grid_size * grid_size
+        self.food_count = food_count
+        self.rng = np.random.default_rng(seed)
+
+        self.walls = np.zeros(self.cells, dtype=bool)
+        for x, y in make_walls(layout, grid_size):
+            self.walls[y * grid_size + x] = True
+
+        self.body = np.zeros((boards, self.cells), dtype=np.int32)
+        self.occupied = np.zeros((boards, self.cells), dtype=bool)
+        self.head_ptr = np.zeros(boards, dtype=np.int32)
+        self.length = np.zeros(boards, dtype=np.int32)
+        self.direction = np.zeros(boards, dtype=np.int8)
+        self.food = np.zeros((boards, food_count), dtype=np.int32)
+        self.score = np.zeros(boards, dtype=np.int32)
+        self.ticks = np.zeros(boards, dtype=np.int32)
+        self.alive = np.zeros(boards, dtype=bool)
+        self._rows = np.arange(boards)
+        self.reset()
+
+    @property
+    def heads(self):
+        return self.body[self._rows, self.head_ptr]
+
+    def reset(self, mask=None):
+        """Restarts the boards selected by `mask` (all boards by default)."""
+        rows = self._rows if mask is None else self._rows[mask]
+        n = self.grid_size
+        start = (n // 2) * n + n // 2
+        self.occupied[rows] = False
+        self.occupied[rows, start] = True
+        self.body[rows, 0] = start
+        self.head_ptr[rows] = 0
+        self.length[rows] = 1
+        self.direction[rows] = RIGHT
+        self.score[rows] = 0
+        self.ticks[rows] = 0
+        self.alive[rows] = True
+        self.food[rows] = -1
+        for slot in range(self.food_count):
+            self._place_food(rows, slot)
+
+    def _blocked(self, rows):
+        """Cells unavailable for food on the given boards: walls, snake and existing food."""
+        blocked = self.occupied[rows] | self.walls
+        placed = self.food[rows]
+        has_food = placed >= 0
+        blocked[np.nonzero(has_food)[0], placed[has_food]] = True
+        return blocked
+
+    def _place_food(self, rows, slot):
+        """Draws a new food cell for `slot` on each board in `rows`."""
+        if len(rows) == 0:
+            return
+        self.food[rows, slot] = -1
+        # Rejection sampling is cheap while boards are mostly empty...
+        pending = rows
+        for _ in range(4):
+            candidates = self.rng.integers(0, self.cells, size=len(pending), dtype=np.int32)
+            ok = ~self._blocked(pending)[np.arange(len(pending)), candidates]
+            self.food[pending[ok], slot] = candidates[ok]
+            pending = pending[~ok]
+            if len(pending) == 0:
+                return
+        # ...and crowded boards fall back to an exact draw over their free cells
+        free = ~self._blocked(pending)
+        keys = self.rng.random(free.shape) * free
+        choice = keys.argmax(axis=1).astype(np.int32)
+        has_room = free.any(axis=1)
+        self.food[pending[has_room], slot] = choice[has_room]
+
+    def step(self, actions=None):
+        """
+        Advances every live board by one tick. `actions` holds a direction code per board
+        (NO_TURN to keep going); reversing onto the body is ignored as in SnakeGame.turn().
+        Returns the boolean mask of boards that died this tick.
+        """
+        n = self.grid_size
+        alive = self.alive.copy()
+        rows = self._rows
+
+        if actions is not None:
+            actions = np.asarray(actions, dtype=np.int8)
+            turn = alive & (actions >= 0) & (actions != OPPOSITE_CODE[self.direction])
+            self.direction[turn] = actions[turn]
+
+        head = self.body[rows, self.head_ptr]
+        nx = head % n + DX[self.direction]
+        ny = head // n + DY[self.direction]
+        out = (nx < 0) | (nx >= n) | (ny < 0) | (ny >= n)
+        new_head = np.where(out, 0, ny * n + nx).astype(np.int32)
+        hit_wall = out | self.walls[new_head]
+        self.ticks[alive] += 1
+
+        moving = alive & ~hit_wall
+        food_hit = (self.food == new_head[:, None]) & moving[:, None]
+        ate = food_hit.any(axis=1)
+
+        # Remove the tail first so the head may move into the cell it leaves
+        pop = moving & ~ate
+        cells = self.body.shape[1]
+        tail_ptr = (self.head_ptr - self.length + 1) % cells
+        tail = self.body[rows, tail_ptr]
+        self.occupied[rows[pop], tail[pop]] = False
+        self.length[pop] -= 1
+
+        hit_self = moving & self.occupied[rows, new_head]
+        grow = moving & ~hit_self
+        grow_rows = rows[grow]
+        self.head_ptr[grow] = (self.head_ptr[grow] + 1) % cells
+        self.body[grow_rows, self.head_ptr[grow]] = new_head[grow]
+        self.occupied[grow_rows, new_head[grow]] = True
+        self.length[grow] += 1
+
+        died = alive & (hit_wall | hit_self)
+
+        eaters = grow & ate
+        if eaters.any():
+            self.score[eaters] += 1
+            eater_rows = rows[eaters]
+            slots = food_hit[eaters].argmax(axis=1)
+            for slot in range(self.food_count):
+                self._place_food(eater_rows[slots == slot], slot)
+            # A board whose snake has filled every free cell is won and finishes
+            no_food = (self.food[eater_rows] < 0).all(axis=1)
+            died[eater_rows[no_food]] = True
+
+        self.alive &= ~died
+        return died
+
+    def greedy_actions(self):
+        """Vectorized greedy bot: the safe direction closest (Manhattan) to any food."""
+        n = self.grid_size
+        head = self.heads
+        hx, hy = head % n, head // n
+        fx, fy = self.food % n, self.food // n
+        tail = self.body[self._rows, (self.head_ptr - self.length + 1) % self.body.shape[1]]
+
+        best = np.full(self.boards, NO_TURN, dtype=np.int8)
+        best_distance = np.full(self.boards, np.iinfo(np.int32).max, dtype=np.int64)
+        for code in range(4):
+            nx, ny = hx + DX[code], hy + DY[code]
+            inside = (nx >= 0) & (nx < n) & (ny >= 0) & (ny < n)
+            cell = np.where(inside, ny * n + nx, 0)
+            safe = inside & ~self.walls[cell] & (~self.occupied[self._rows, cell] | (cell == tail))
+            safe &= OPPOSITE_CODE[self.direction] != code
+            distance = (np.abs(fx - nx[:, None]) + np.abs(fy - ny[:, None]))
+            distance = np.where(self.food >= 0, distance, np.iinfo(np.int32).max).min(axis=1)
+            better = safe & (distance < best_distance)
+            best[better] = code
+            best_distance[better] = distance[better]
+        return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--boards", type=int, default=4096)
+    parser.add_argument("--ticks", type=int, default=1000)
+    parser.add_argument("--grid-size", type=int, default=20)
+    parser.add_argument("--layout", choices=WALL_LAYOUTS, default="none")
+    parser.add_argument("--foods", type=int, choices=range(1, MAX_FOOD + 1), default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    batch = BatchSnake(args.boards, args.grid_size, args.layout, args.foods, seed=args.seed)
+    finished_scores = []
+    start = time.perf_counter()
+    board_ticks = 0
+    for _ in range(args.ticks):
+        board_ticks += int(batch.alive.sum())
+        died = batch.step(batch.greedy_actions())
+        if died.any():
+            # Finished boards restart straight away so the batch stays fully loaded
+            finished_scores.extend(batch.score[died].tolist())
+            batch.reset(died)
+    elapsed = time.perf_counter() - start
+
+    print(f"boards={args.boards} grid={args.grid_size} layout={args.layout} foods={args.foods} ticks={args.ticks}")
+    print(f"board-ticks/s: {board_ticks / elapsed:,.0f}  ({elapsed * 1000 / args.ticks:.2f} ms per batch tick)")
+    if finished_scores:
+        print(f"finished games: {len(finished_scores)}  mean score: {np.mean(finished_scores):.1f}  "
+              f"max score: {max(finished_scores)}")
+
+
+if __name__ == "__main__":
+    main()
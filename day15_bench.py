@@ -0,0 +1,88 @@
+"""
+Micro-benchmark for the day15 Snake engine and board renderer.
+Reports engine ticks/second and HTML frame-build time for each grid size, so larger
+boards are only exposed in the UI once they are known to hold up.
+
+Usage: python day15_bench.py [--sizes 10 20 40 100 200] [--layout pillars] [--foods 3]
+"""
+import argparse
+import time
+from collections import deque
+
+from day15_engine import WALL_LAYOUTS, MAX_FOOD, SnakeGame
+from day15_render import BoardRenderer
+from day15_selfplay import greedy_policy
+
+COLORS = {
+    "background": "#2c3e50",
+    "snake_head": "#27ae60",
+    "snake_body": "#2ecc71",
+    "food": "#e74c3c",
+    "wall": "#34495e"
+}
+
+RESET_ROUNDS = 20
+
+
+def bench_engine(grid_size, layout, foods, ticks):
+    """Returns (ticks per second, average reset time in ms) for one board setting."""
+    game = SnakeGame(grid_size, seed=0, layout=layout, food_count=foods)
+    resets = 1
+    step_time = 0.0
+    for _ in range(ticks):
+        if game.game_over:
+            game.reset(seed=resets)
+            resets += 1
+        # Only step() is timed; the policy is not part of the engine cost
+        direction = greedy_policy(game)
+        if direction is not None and direction != game.direction:
+            game.turn(direction)
+        start = time.perf_counter()
+        game.step()
+        step_time += time.perf_counter() - start
+
+    start = time.perf_counter()
+    for seed in range(RESET_ROUNDS):
+        game.reset(seed=seed)
+    reset_time = (time.perf_counter() - start) / RESET_ROUNDS
+    return ticks / step_time, reset_time * 1000
+
+
+def bench_render(grid_size, layout, foods, snake_length, frames):
+    """Returns the average frame-build time in microseconds and the frame size in bytes."""
+    game = SnakeGame(grid_size, seed=1, layout=layout, food_count=foods)
+    # Lay a snake of the requested length across free cells so the frame reflects a late-game board
+    cells = [
+        (x, y) for y in range(grid_size) for x in range(grid_size)
+        if not game.is_wall((x, y)) and (x, y) not in game.foods
+    ]
+    game.snake = deque(cells[:snake_length])
+    renderer = BoardRenderer(grid_size, max(2, 400 // grid_size), COLORS, game.walls)
+
+    start = time.perf_counter()
+    for _ in range(frames):
+        html = renderer.frame(game)
+    elapsed = time.perf_counter() - start
+    return elapsed / frames * 1e6, len(html)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 20, 40, 100, 200])
+    parser.add_argument("--layout", choices=WALL_LAYOUTS, default="none")
+    parser.add_argument("--foods", type=int, choices=range(1, MAX_FOOD + 1), default=1)
+    parser.add_argument("--ticks", type=int, default=200_000)
+    parser.add_argument("--snake-length", type=int, default=50)
+    parser.add_argument("--frames", type=int, default=500)
+    args = parser.parse_args()
+
+    print(f"layout={args.layout} foods={args.foods} ticks={args.ticks} snake_length={args.snake_length}")
+    print(f"{'grid':>9} {'ticks/s':>12} {'reset ms':>9} {'frame us':>9} {'frame bytes':>12}")
+    for size in args.sizes:
+        ticks_per_sec, reset_ms = bench_engine(size, args.layout, args.foods, args.ticks)
+        frame_us, frame_bytes = bench_render(size, args.layout, args.foods, args.snake_length, args.frames)
+        print(f"{size:>4}x{size:<4} {ticks_per_sec:>12,.0f} {reset_ms:>9.2f} {frame_us:>9.1f} {frame_bytes:>12,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,297 @@
+import random
+from collections import deque
+
+# --- Engine Configuration ---
+GRID_SIZE = 20
+MIN_GRID_SIZE = 5
+MAX_GRID_SIZE = 200
+MAX_FOOD = 10
+START_SPEED = 0.2
+MIN_SPEED = 0.05
+SPEED_STEP = 0.005
+# Bounds on a move log from the browser, checked before it is replayed
+MAX_TURNS_PER_TICK = 8      # key presses (including repeats) logged between two steps
+TICKS_PER_CELL = 1000       # a game may last at most this many ticks per board cell
+TICK_GRACE = 50             # slack for timer jitter between the browser and the server
+
+# Movement vectors for each direction
+DIRECTIONS = {
+    "Up": (0, -1),
+    "Down": (0, 1),
+    "Left": (-1, 0),
+    "Right": (1, 0)
+}
+
+MASK32 = 0xFFFFFFFF
+
+OPPOSITE = {
+    "Up": "Down",
+    "Down": "Up",
+    "Left": "Right",
+    "Right": "Left"
+}
+
+
+class Mulberry32:
+    """
+    Small 32-bit PRNG. It is mirrored bit-for-bit by the browser game loop in
+    day15_component/index.html, so a game played client-side can be replayed here exactly.
+    """
+
+    def __init__(self, seed):
+        self.state = seed & MASK32
+
+    def next_u32(self):
+        self.state = (self.state + 0x6D2B79F5) & MASK32
+        t = self.state
+        t = ((t ^ (t >> 15)) * (t | 1)) & MASK32
+        t = ((t + (((t ^ (t >> 7)) * (t | 61)) & MASK32)) & MASK32) ^ t
+        return (t ^ (t >> 14)) & MASK32
+
+    def randrange(self, n):
+        return self.next_u32() % n
+
+
+def make_walls(layout, grid_size):
+    """
+    Builds the obstacle cells for a named layout.
+    The snake's starting row is always left open so it never spawns facing a wall.
+    """
+    n = grid_size
+    if layout == "none":
+        return frozenset()
+    if layout == "border":
+        return frozenset(
+            (x, y) for y in range(n) for x in range(n)
+            if x == 0 or y == 0 or x == n - 1 or y == n - 1
+        )
+    if layout == "pillars":
+        # 2x2 blocks on a regular lattice, skipping any block that touches the start row
+        spacing = max(4, n // 5)
+        walls = set()
+        for gy in range(spacing // 2, n - 1, spacing):
+            if gy <= n // 2 <= gy + 1:
+                continue
+            for gx in range(spacing // 2, n - 1, spacing):
+                walls.update({(gx, gy), (gx + 1, gy), (gx, gy + 1), (gx + 1, gy + 1)})
+        return frozenset(walls)
+    raise ValueError(f"Unknown wall layout: {layout}")
+
+
+WALL_LAYOUTS = ("none", "border", "pillars")
+
+
+def new_seed():
+    """Returns a fresh random 32-bit game seed."""
+    return random.getrandbits(32)
+
+
+class SnakeGame:
+    """
+    Pure Snake game state with no Streamlit dependency.
+    These are the authoritative rules: the browser loop in day15_component mirrors them and
+    day15.py replays its move log here, while bots, replays and load tests drive it directly.
+    """
+
+    def __init__(self, grid_size=GRID_SIZE, seed=None, layout="none", food_count=1):
+        if not MIN_GRID_SIZE <= grid_size <= MAX_GRID_SIZE:
+            raise ValueError(f"Grid size must be between {MIN_GRID_SIZE} and {MAX_GRID_SIZE}")
+        if not 1 <= food_count <= MAX_FOOD:
+            raise ValueError(f"Food count must be between 1 and {MAX_FOOD}")
+        self.grid_size = grid_size
+        self.layout = layout
+        self.walls = make_walls(layout, grid_size)
+        self.food_count = food_count
+        self.reset(seed)
+
+    def reset(self, seed=None):
+        """Initializes or resets the game state. A new random seed is drawn unless one is given."""
+        self.seed = new_seed() if seed is None else seed
+        self.rng = Mulberry32(self.seed)
+        self.game_over = False
+        self.score = 0
+        self.ticks = 0
+        # The snake starts in the center of the grid.
+        # `snake` is ordered head-first; `occupied` mirrors it as a set for O(1) lookups.
+        start = (self.grid_size // 2, self.grid_size // 2)
+        self.snake = deque([start])
+        self.occupied = {start}
+        # Pool of cells holding no snake, wall or food, plus each cell's index in it,
+        # so cells can be taken or returned in O(1) by swapping with the last entry
+        self._free = [
+            (x, y) for y in range(self.grid_size) for x in range(self.grid_size)
+            if (x, y) not in self.walls
+        ]
+        self._free_index = {cell: i for i, cell in enumerate(self._free)}
+        self._take_cell(start)
+        self.direction = "Right"
+        self.moves = []
+        self.speed = START_SPEED
+        self.foods = set()
+        for _ in range(self.food_count):
+            self.generate_food()
+
+    @property
+    def head(self):
+        return self.snake[0]
+
+    def turn(self, direction):
+        """Changes direction unless it would reverse the snake onto itself."""
+        if not self.game_over and direction in DIRECTIONS and self.direction != OPPOSITE[direction]:
+            self.direction = direction
+            # Accepted turns are logged so the game can be replayed from its seed
+            self.moves.append((self.ticks, direction))
+            return True
+        return False
+
+    def snapshot(self):
+        """Captures the full game state so it can be restored later, e.g. when seeking a replay."""
+        return (
+            self.seed, self.rng.state, self.game_over, self.score, self.ticks, self.direction,
+            self.speed, tuple(self.snake), tuple(self.foods), tuple(self._free), len(self.moves)
+        )
+
+    def restore(self, snapshot):
+        """Restores a state captured by snapshot() on a game with the same board settings."""
+        (self.seed, self.rng.state, self.game_over, self.score, self.ticks, self.direction,
+         self.speed, snake, foods, free, move_count) = snapshot
+        self.snake = deque(snake)
+        self.occupied = set(snake)
+        self.foods = set(foods)
+        self._free = list(free)
+        self._free_index = {cell: i for i, cell in enumerate(self._free)}
+        del self.moves[move_count:]
+
+    def _take_cell(self, cell):
+        """Removes a cell from the free pool."""
+        i = self._free_index.pop(cell)
+        last = self._free.pop()
+        if last != cell:
+            self._free[i] = last
+            self._free_index[last] = i
+
+    def _release_cell(self, cell):
+        """Returns a cell to the free pool."""
+        self._free_index[cell] = len(self._free)
+        self._free.append(cell)
+
+    def generate_food(self):
+        """Places one food item on a random free cell. Returns False if there is no room."""
+        if not self._free:
+            return False
+        food = self._free[self.rng.randrange(len(self._free))]
+        self._take_cell(food)
+        self.foods.add(food)
+        return True
+
+    def is_wall(self, cell):
+        """Checks whether a cell lies outside the grid or on an obstacle."""
+        x, y = cell
+        return x < 0 or x >= self.grid_size or y < 0 or y >= self.grid_size or cell in self.walls
+
+    def step(self):
+        """Advances the game by one tick in O(1). Returns False once the game is over."""
+        if self.game_over:
+            return False
+
+        head_x, head_y = self.snake[0]
+        dx, dy = DIRECTIONS[self.direction]
+        new_head = (head_x + dx, head_y + dy)
+        self.ticks += 1
+
+        # Check for wall collision
+        if self.is_wall(new_head):
+            self.game_over = True
+            return False
+
+        ate_food = new_head in self.foods
+        if not ate_food:
+            # Remove the tail first so the head may move into the cell it leaves
+            tail = self.snake.pop()
+            self.occupied.discard(tail)
+            self._release_cell(tail)
+
+        # Check for self-collision
+        if new_head in self.occupied:
+            self.game_over = True
+            return False
+
+        # Add the new head to the snake (a food cell is already out of the free pool)
+        self.snake.appendleft(new_head)
+        self.occupied.add(new_head)
+
+        if ate_food:
+            self.foods.discard(new_head)
+            self.score += 1
+            # Increase speed slightly for more challenge
+            if self.speed > MIN_SPEED:
+                self.speed -= SPEED_STEP
+            # Once no food can be placed and none is left, the snake has filled the board and won
+            if not self.generate_food() and not self.foods:
+                self.game_over = True
+                return False
+        else:
+            self._take_cell(new_head)
+
+        return True
+
+    def run(self, ticks):
+        """Steps the game up to `ticks` times without any delay. Returns ticks played."""
+        start = self.ticks
+        while self.ticks - start < ticks and self.step():
+            pass
+        return self.ticks - start
+
+
+def replay_moves(seed, moves, ticks, grid_size=GRID_SIZE, layout="none", food_count=1):
+    """
+    Re-simulates a game from its seed and move log.
+    `moves` is a list of (tick, direction) pairs, each applied once `tick` steps have been played.
+    Returns the game after at most `ticks` steps.
+    """
+    game = SnakeGame(grid_size, seed=seed, layout=layout, food_count=food_count)
+    for tick, direction in moves:
+        if tick < game.ticks or tick > ticks:
+            raise ValueError(f"Move at tick {tick} is out of order")
+        game.run(tick - game.ticks)
+        if game.game_over:
+            break
+        game.turn(direction)
+    game.run(ticks - game.ticks)
+    return game
+
+
+def max_ticks(grid_size, elapsed):
+    """
+    The most ticks a genuine game can have played on a board of `grid_size` within
+    `elapsed` seconds. The browser never steps faster than MIN_SPEED, so a longer log
+    is forged, and rejecting it up front keeps the replay cost bounded.
+    """
+    return min(TICKS_PER_CELL * grid_size * grid_size, int(elapsed / MIN_SPEED) + TICK_GRACE)
+
+
+def verify_game(result, seed, elapsed):
+    """
+    Replays a move log reported by the browser and checks the claimed score.
+    The board settings come from the log itself and are validated by SnakeGame;
+    `elapsed` is the number of seconds since the seed was issued.
+    Returns the replayed game if the log is genuine, otherwise None.
+    """
+    try:
+        if int(result["seed"]) != seed:
+            return None
+        ticks, grid_size = int(result["ticks"]), int(result["grid_size"])
+        if not 0 < ticks <= max_ticks(grid_size, elapsed):
+            return None
+        if len(result["moves"]) > MAX_TURNS_PER_TICK * ticks:
+            return None
+        moves = [(int(tick), str(direction)) for tick, direction in result["moves"]]
+        game = replay_moves(
+            seed, moves, ticks, grid_size, str(result["layout"]), int(result["food_count"])
+        )
+    except (KeyError, TypeError, ValueError):
+        return None
+
+    if not game.game_over or game.ticks != int(result["ticks"]) or game.score != int(result["score"]):
+        return None
+    return game
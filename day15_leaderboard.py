@@ -0,0 +1,51 @@
+import heapq
+import threading
+
+from csv_log import CsvLog
+
+HEADER = ["Name", "Score"]
+
+
+class Leaderboard:
+    """
+    Append-only Snake leaderboard backed by a Name,Score CSV file.
+    Keeps the best `k` scores in a min-heap fed by a CsvLog, so the file is streamed once
+    at startup and later refreshes only parse rows appended since then.
+    """
+
+    def __init__(self, path, k=10):
+        self.path = path
+        self.k = k
+        self._heap = []     # (score, -sequence, name); the weakest kept entry sits on top
+        self._rows = 0
+        self._mutex = threading.Lock()
+        # Every score is fsynced as it is written
+        self._log = CsvLog(path, HEADER, self._on_row, fsync_every=1)
+
+    def _on_row(self, row):
+        try:
+            name, score = row[0], int(row[1])
+        except (IndexError, ValueError):
+            return
+        with self._mutex:
+            self._rows += 1
+            # On equal scores the older entry ranks higher
+            entry = (score, -self._rows, name)
+            if len(self._heap) < self.k:
+                heapq.heappush(self._heap, entry)
+            elif entry > self._heap[0]:
+                heapq.heapreplace(self._heap, entry)
+
+    def refresh(self):
+        """Picks up scores appended by other sessions or processes since the last read."""
+        self._log.refresh()
+
+    def add(self, name, score):
+        """Atomically appends a score and updates the in-memory top-K."""
+        self._log.append([name, score])
+
+    def top(self):
+        """Returns the best scores as (name, score) pairs, highest first."""
+        with self._mutex:
+            entries = sorted(self._heap, reverse=True)
+        return [(name, score) for score, _, name in entries]
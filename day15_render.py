@@ -0,0 +1,57 @@
+# --- Board Renderer ---
+# Builds the Snake board as a compact HTML frame. Only occupied cells are emitted and each
+# is placed with `grid-area`, so the frame size depends on the snake length, not the grid size.
+
+
+class BoardRenderer:
+    """Renders a SnakeGame to HTML from precomputed templates with a single join per frame."""
+
+    def __init__(self, grid_size, cell_size, colors, walls=()):
+        self.grid_size = grid_size
+        self.cell_size = cell_size
+        self.colors = colors
+
+        # Shared styling is sent once per frame in a <style> block instead of inline on every cell
+        self.header = (
+            "<style>"
+            ".snake-board{{display:grid;"
+            "grid-template-columns:repeat({n},{c}px);grid-template-rows:repeat({n},{c}px);"
+            "width:{px}px;height:{px}px;background-color:{bg};border-radius:10px;overflow:hidden}}"
+            ".snake-board i{{border-radius:{radius}px;margin:{gap}px}}"
+            ".snake-board .h{{background-color:{head}}}"
+            ".snake-board .b{{background-color:{body}}}"
+            ".snake-board .f{{background-color:{food}}}"
+            ".snake-board .w{{background-color:{wall}}}"
+            "</style><div class=\"snake-board\">"
+        ).format(
+            # A 1px gap would shrink cells under 4px to nothing, so small cells touch instead
+            n=grid_size, c=cell_size, px=grid_size * cell_size,
+            gap=1 if cell_size >= 4 else 0, radius=3 if cell_size >= 4 else 0,
+            bg=colors['background'], head=colors['snake_head'], body=colors['snake_body'],
+            food=colors['food'], wall=colors['wall']
+        )
+        self.footer = "</div>"
+
+        # Cell templates keyed by kind: head, body, food, wall
+        self.templates = {
+            kind: '<i class="' + kind + '" style="grid-area:{}/{}"></i>'
+            for kind in ("h", "b", "f", "w")
+        }
+        # Walls never move, so their cells are built once and reused by every frame
+        self.walls = "".join(self.cell("w", x, y) for x, y in sorted(walls))
+
+    def cell(self, kind, x, y):
+        """Returns the HTML for one occupied cell (grid lines are 1-based)."""
+        return self.templates[kind].format(y + 1, x + 1)
+
+    def frame(self, game):
+        """Builds the full board frame for the current game state."""
+        body = self.templates["b"]
+        parts = [self.header, self.walls]
+        parts.extend(self.cell("f", x, y) for x, y in game.foods)
+        snake = iter(game.snake)
+        head = next(snake)
+        parts.append(self.cell("h", *head))
+        parts.extend(body.format(y + 1, x + 1) for x, y in snake)
+        parts.append(self.footer)
+        return "".join(parts)
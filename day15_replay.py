@@ -0,0 +1,186 @@
+import argparse
+import bisect
+import os
+import struct
+import time
+from datetime import datetime
+
+from day15_engine import DIRECTIONS, WALL_LAYOUTS, SnakeGame
+
+# --- Replay Format ---
+# A replay stores only what is needed to re-simulate a game deterministically:
+#   header: magic, version, seed (u32), grid size (u16), layout (u8), food count (u8)
+#   body:   varint total ticks, varint move count, then one varint per move holding
+#           (ticks since the previous move << 2) | direction code
+# A typical game is a few hundred bytes, however many frames it lasted.
+MAGIC = b"SNK"
+VERSION = 1
+HEADER = struct.Struct("<3sBIHBB")
+DIRECTION_CODES = {direction: code for code, direction in enumerate(DIRECTIONS)}
+CODE_DIRECTIONS = list(DIRECTIONS)
+
+REPLAY_DIR = "snake_replays"
+SNAPSHOT_INTERVAL = 500
+
+
+def _write_varint(out, value):
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(data, pos):
+    value = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+class Replay:
+    """A recorded game: board settings, seed, accepted direction changes and final tick count."""
+
+    def __init__(self, seed, grid_size, layout, food_count, moves, ticks):
+        self.seed = seed
+        self.grid_size = grid_size
+        self.layout = layout
+        self.food_count = food_count
+        self.moves = list(moves)
+        self.ticks = ticks
+
+    @classmethod
+    def from_game(cls, game):
+        """Records a finished (or in-progress) SnakeGame."""
+        return cls(game.seed, game.grid_size, game.layout, game.food_count, game.moves, game.ticks)
+
+    def new_game(self):
+        """Returns a fresh game at tick 0 with this replay's settings."""
+        return SnakeGame(self.grid_size, seed=self.seed, layout=self.layout, food_count=self.food_count)
+
+    def to_bytes(self):
+        out = bytearray(HEADER.pack(
+            MAGIC, VERSION, self.seed, self.grid_size, WALL_LAYOUTS.index(self.layout), self.food_count
+        ))
+        _write_varint(out, self.ticks)
+        _write_varint(out, len(self.moves))
+        previous = 0
+        for tick, direction in self.moves:
+            _write_varint(out, ((tick - previous) << 2) | DIRECTION_CODES[direction])
+            previous = tick
+        return bytes(out)
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Decodes a replay; raises ValueError if the data is not a complete replay."""
+        try:
+            magic, version, seed, grid_size, layout, food_count = HEADER.unpack_from(data)
+            if magic != MAGIC or version != VERSION:
+                raise ValueError("Not a Snake replay file")
+            pos = HEADER.size
+            ticks, pos = _read_varint(data, pos)
+            count, pos = _read_varint(data, pos)
+            moves = []
+            tick = 0
+            for _ in range(count):
+                value, pos = _read_varint(data, pos)
+                tick += value >> 2
+                moves.append((tick, CODE_DIRECTIONS[value & 3]))
+            return cls(seed, grid_size, WALL_LAYOUTS[layout], food_count, moves, ticks)
+        except (struct.error, IndexError) as error:
+            raise ValueError("Truncated or corrupt Snake replay file") from error
+
+
+def save_replay(replay, directory=REPLAY_DIR):
+    """Writes a replay to its own small file and returns the path."""
+    os.makedirs(directory, exist_ok=True)
+    name = f"{datetime.now().strftime('%Y%m%d%H%M%S')}_{replay.seed:08x}.snk"
+    path = os.path.join(directory, name)
+    with open(path, "wb") as f:
+        f.write(replay.to_bytes())
+    return path
+
+
+def load_replay(path):
+    with open(path, "rb") as f:
+        return Replay.from_bytes(f.read())
+
+
+def list_replays(directory=REPLAY_DIR, limit=20):
+    """Returns the newest replay files, newest first."""
+    if not os.path.isdir(directory):
+        return []
+    names = sorted((name for name in os.listdir(directory) if name.endswith(".snk")), reverse=True)
+    return [os.path.join(directory, name) for name in names[:limit]]
+
+
+class ReplayPlayer:
+    """
+    Re-simulates a replay at any speed and seeks to any tick.
+    Snapshots are taken every `snapshot_interval` ticks while playing forward, so seeking
+    backwards (or to an already visited region) only replays from the nearest snapshot.
+    """
+
+    def __init__(self, replay, snapshot_interval=SNAPSHOT_INTERVAL):
+        self.replay = replay
+        self.snapshot_interval = snapshot_interval
+        self.game = replay.new_game()
+        self._next_move = 0
+        self._snapshots = {0: (self.game.snapshot(), 0)}
+        self._snapshot_ticks = [0]
+
+    @property
+    def tick(self):
+        return self.game.ticks
+
+    def advance(self, ticks):
+        """Plays forward up to `ticks` ticks (stopping at the end of the replay)."""
+        game = self.game
+        moves = self.replay.moves
+        target = min(game.ticks + ticks, self.replay.ticks)
+        while game.ticks < target and not game.game_over:
+            # Apply every direction change logged for the current tick before stepping
+            while self._next_move < len(moves) and moves[self._next_move][0] == game.ticks:
+                game.turn(moves[self._next_move][1])
+                self._next_move += 1
+            game.step()
+            if game.ticks % self.snapshot_interval == 0 and game.ticks not in self._snapshots:
+                self._snapshots[game.ticks] = (game.snapshot(), self._next_move)
+                bisect.insort(self._snapshot_ticks, game.ticks)
+        return game
+
+    def seek(self, tick):
+        """Jumps to `tick`, restoring the nearest earlier snapshot instead of replaying from zero."""
+        tick = max(0, min(tick, self.replay.ticks))
+        base = self._snapshot_ticks[bisect.bisect_right(self._snapshot_ticks, tick) - 1]
+        if tick < self.game.ticks or base > self.game.ticks:
+            snapshot, self._next_move = self._snapshots[base]
+            self.game.restore(snapshot)
+        return self.advance(tick - self.game.ticks)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-simulate a recorded Snake game at full speed.")
+    parser.add_argument("path", help="replay file (.snk)")
+    parser.add_argument("--tick", type=int, help="show the state at this tick instead of the end")
+    args = parser.parse_args()
+
+    replay = load_replay(args.path)
+    print(f"seed={replay.seed:08x} grid={replay.grid_size} layout={replay.layout} "
+          f"foods={replay.food_count} ticks={replay.ticks} moves={len(replay.moves)} "
+          f"size={os.path.getsize(args.path)} bytes")
+
+    player = ReplayPlayer(replay)
+    start = time.perf_counter()
+    game = player.seek(replay.ticks if args.tick is None else args.tick)
+    elapsed = time.perf_counter() - start
+    print(f"tick={game.ticks} score={game.score} length={len(game.snake)} game_over={game.game_over}")
+    print(f"re-simulated in {elapsed * 1000:.2f} ms ({game.ticks / max(elapsed, 1e-9):,.0f} ticks/s)")
+
+
+if __name__ == "__main__":
+    main()
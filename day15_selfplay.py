@@ -0,0 +1,199 @@
+"""
+Batch self-play harness for the day15 Snake engine.
+Runs N bot games per policy across a process pool and reports score distributions,
+average game length and ticks/second throughput. Useful both as an engine speed
+regression benchmark and for tuning difficulty.
+
+Usage: python day15_selfplay.py [--games 200] [--policies greedy bfs hamiltonian] [--workers 4]
+"""
+import argparse
+import os
+import statistics
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from day15_engine import DIRECTIONS, OPPOSITE, WALL_LAYOUTS, MAX_FOOD, SnakeGame
+
+MAX_TICKS = 200_000
+
+
+# --- Policies ---
+# A policy looks at the game and returns the direction to take on the next tick (or None to
+# keep going straight). Each one is built per game by a factory so it can precompute state.
+
+def _is_free(game, cell):
+    """A cell the head may enter next tick (the tail cell is vacated as the snake moves)."""
+    return not game.is_wall(cell) and (cell not in game.occupied or cell == game.snake[-1])
+
+
+def _safe_moves(game):
+    head_x, head_y = game.head
+    for direction, (dx, dy) in DIRECTIONS.items():
+        cell = (head_x + dx, head_y + dy)
+        if direction != OPPOSITE[game.direction] and _is_free(game, cell):
+            yield direction, cell
+
+
+def greedy_policy(game):
+    """Steps towards the nearest food by Manhattan distance without hitting anything."""
+    best, best_distance = None, None
+    for direction, (x, y) in _safe_moves(game):
+        distance = min(abs(x - fx) + abs(y - fy) for fx, fy in game.foods)
+        if best_distance is None or distance < best_distance:
+            best, best_distance = direction, distance
+    return best
+
+
+def make_greedy(game):
+    return greedy_policy
+
+
+def bfs_policy(game):
+    """Follows the shortest path to any food, falling back to greedy when none is reachable."""
+    head = game.head
+    first_step = {}
+    queue = deque()
+    for direction, cell in _safe_moves(game):
+        if cell in game.foods:
+            return direction
+        first_step[cell] = direction
+        queue.append(cell)
+
+    seen = set(first_step)
+    seen.add(head)
+    while queue:
+        cell = queue.popleft()
+        x, y = cell
+        for dx, dy in DIRECTIONS.values():
+            nxt = (x + dx, y + dy)
+            if nxt in seen or game.is_wall(nxt) or nxt in game.occupied:
+                continue
+            if nxt in game.foods:
+                return first_step[cell]
+            seen.add(nxt)
+            first_step[nxt] = first_step[cell]
+            queue.append(nxt)
+    return greedy_policy(game)
+
+
+def make_bfs(game):
+    return bfs_policy
+
+
+def make_hamiltonian(game):
+    """
+    Follows a fixed Hamiltonian cycle over the whole board, which never dies and eventually
+    fills it. The cycle snakes right/left along the rows from column 1 and returns up column 0,
+    so it needs an even, wall-free grid.
+    """
+    n = game.grid_size
+    if n % 2 or game.walls:
+        raise ValueError("The hamiltonian policy needs an even grid size with no walls")
+
+    order = []
+    for y in range(n):
+        xs = range(1, n) if y % 2 == 0 else range(n - 1, 0, -1)
+        order.extend((x, y) for x in xs)
+    order.extend((0, y) for y in range(n - 1, -1, -1))
+    step_to = {}
+    for cell, nxt in zip(order, order[1:] + order[:1]):
+        step_to[cell] = (nxt[0] - cell[0], nxt[1] - cell[1])
+    direction_of = {vector: direction for direction, vector in DIRECTIONS.items()}
+
+    def hamiltonian_policy(game):
+        direction = direction_of[step_to[game.head]]
+        if direction == OPPOSITE[game.direction]:
+            # Only possible at the very start, before the snake has joined the cycle
+            return greedy_policy(game)
+        return direction
+
+    return hamiltonian_policy
+
+
+POLICIES = {
+    "greedy": make_greedy,
+    "bfs": make_bfs,
+    "hamiltonian": make_hamiltonian,
+}
+
+
+# --- Workers ---
+
+def play_game(policy_name, grid_size, layout, food_count, seed, max_ticks=MAX_TICKS):
+    """Plays one bot game and returns (score, ticks)."""
+    game = SnakeGame(grid_size, seed=seed, layout=layout, food_count=food_count)
+    policy = POLICIES[policy_name](game)
+    while not game.game_over and game.ticks < max_ticks:
+        direction = policy(game)
+        if direction is not None and direction != game.direction:
+            game.turn(direction)
+        game.step()
+    return game.score, game.ticks
+
+
+def run_batch(job):
+    """Process-pool entry point: plays a batch of seeds and returns (results, busy seconds)."""
+    policy_name, grid_size, layout, food_count, seeds, max_ticks = job
+    start = time.perf_counter()
+    results = [play_game(policy_name, grid_size, layout, food_count, seed, max_ticks) for seed in seeds]
+    return results, time.perf_counter() - start
+
+
+def run_policy(pool, policy_name, games, workers, grid_size, layout, food_count, max_ticks):
+    """Spreads `games` seeds over the pool and returns (results, wall seconds, busy seconds)."""
+    seeds = list(range(games))
+    batches = [seeds[i::workers] for i in range(workers) if seeds[i::workers]]
+    jobs = [(policy_name, grid_size, layout, food_count, batch, max_ticks) for batch in batches]
+
+    start = time.perf_counter()
+    results = []
+    busy = 0.0
+    for batch_results, batch_time in pool.map(run_batch, jobs):
+        results.extend(batch_results)
+        busy += batch_time
+    return results, time.perf_counter() - start, busy
+
+
+def report(policy_name, results, wall, busy):
+    scores = sorted(score for score, _ in results)
+    ticks = sum(t for _, t in results)
+    quartiles = statistics.quantiles(scores, n=4) if len(scores) > 1 else [scores[0]] * 3
+    print(
+        f"{policy_name:<12} {len(scores):>6} {statistics.mean(scores):>8.1f} "
+        f"{statistics.pstdev(scores):>7.1f} {scores[0]:>5} {quartiles[0]:>6.0f} {quartiles[1]:>6.0f} "
+        f"{quartiles[2]:>6.0f} {scores[-1]:>5} {ticks / len(scores):>10,.0f} "
+        f"{ticks / wall:>12,.0f} {ticks / busy:>12,.0f}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--games", type=int, default=200)
+    parser.add_argument("--policies", nargs="+", choices=POLICIES, default=list(POLICIES))
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--grid-size", type=int, default=20)
+    parser.add_argument("--layout", choices=WALL_LAYOUTS, default="none")
+    parser.add_argument("--foods", type=int, choices=range(1, MAX_FOOD + 1), default=1)
+    parser.add_argument("--max-ticks", type=int, default=MAX_TICKS)
+    args = parser.parse_args()
+
+    print(f"grid={args.grid_size} layout={args.layout} foods={args.foods} "
+          f"games={args.games} workers={args.workers}")
+    print(f"{'policy':<12} {'games':>6} {'mean':>8} {'std':>7} {'min':>5} {'p25':>6} {'p50':>6} "
+          f"{'p75':>6} {'max':>5} {'ticks/game':>10} {'ticks/s':>12} {'ticks/s/core':>12}")
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        for policy_name in args.policies:
+            try:
+                results, wall, busy = run_policy(
+                    pool, policy_name, args.games, args.workers,
+                    args.grid_size, args.layout, args.foods, args.max_ticks
+                )
+            except ValueError as e:
+                print(f"{policy_name:<12} skipped: {e}")
+                continue
+            report(policy_name, results, wall, busy)
+
+
+if __name__ == "__main__":
+    main()